@@ -1,4 +1,5 @@
 from odoo import api, fields, models, _
+from odoo.osv import expression
 
 
 class SaleOrder(models.Model):
@@ -12,15 +13,28 @@ class SaleOrder(models.Model):
             "view_mode": "tree,form",
             'views': [(tree_id, 'tree'),(form_id,'form')],
             "res_model": "purchase.order",
-            "domain":[('origin', '=', self.name)],
+            "domain":[('id', 'in', self._get_purchase_orders()[self.id].ids)],
             "type": "ir.actions.act_window",
             "target": "current",
         }
 
-    def _get_po(self):
+    def _get_purchase_orders(self):
+        """Purchase orders converted from each order, an origin may list several orders"""
+        result = {order.id: self.env['purchase.order'] for order in self}
+        order_ids = {order.name: order.id for order in self if order.name}
+        if not order_ids:
+            return result
+        domain = expression.OR([[('origin', 'ilike', name)] for name in order_ids])
+        for purchase in self.env['purchase.order'].search(domain):
+            for name in (purchase.origin or '').split(','):
+                order_id = order_ids.get(name.strip())
+                if order_id:
+                    result[order_id] |= purchase
+        return result
 
+    def _get_po(self):
+        purchase_orders = self._get_purchase_orders()
         for orders in self:
-            purchase_ids = self.env['purchase.order'].search([('origin', '=', self.name)])
-        orders.po_count = len(purchase_ids)
+            orders.po_count = len(purchase_orders[orders.id])
 
     po_count = fields.Integer(compute='_get_po', string='Purchase Orders')
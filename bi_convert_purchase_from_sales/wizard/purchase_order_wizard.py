@@ -2,10 +2,105 @@
 # Part of BrowseInfo. See LICENSE file for full copyright and licensing details.
 
 import time
+from collections import defaultdict
 from odoo import api, fields, models, _
 from datetime import datetime
+from markupsafe import Markup
 import odoo.addons.decimal_precision as dp
 from odoo.exceptions import UserError
+from odoo.tools import float_compare
+
+
+class PurchasePriceResolver(object):
+    """Unit prices of the converted lines for one vendor
+
+    The vendor's supplier info of all the products is read in one search
+    (every vendor's when ``partner`` is empty, to find preferred vendors)
+    and the seller of each line is picked from those rows in memory, with
+    the same rules as ``product._select_seller``. Selections are memoized
+    per product, UoM and quantity bracket (which minimum quantities the
+    quantity reaches), taxes are fixed once per price and currency rates
+    fetched once per (from, to, company, date), so no line queries the
+    supplier info again.
+    """
+
+    def __init__(self, env, products, partner, date):
+        self.env = env
+        self.partner = partner
+        self.date = date
+        self.precision = env['decimal.precision'].precision_get('Product Unit of Measure')
+        # Only the vendor's (or its parent's) rows can be selected, sudo so the brackets never miss one
+        domain = [('product_tmpl_id', 'in', products.mapped('product_tmpl_id').ids)]
+        if partner:
+            domain.append(('partner_id', 'in', (partner | partner.parent_id).ids))
+        sellers = env['product.supplierinfo'].sudo().search(domain).filtered(
+            lambda s: s.partner_id.active and (not s.company_id or s.company_id.id == env.company.id))
+        # Same order as product._prepare_sellers
+        self.sellers = defaultdict(list)
+        for seller in sellers.sorted(lambda s: (s.sequence, -s.min_qty, s.price, s.id)):
+            self.sellers[seller.product_tmpl_id.id].append(seller)
+        self.seller_cache = {}
+        self.price_cache = {}
+        self.rate_cache = {}
+
+    def _quantity_bracket(self, product, quantity, uom):
+        # Same quantity conversion and comparison as _select_seller
+        bracket = []
+        for seller in self.sellers.get(product.product_tmpl_id.id, []):
+            seller_quantity = quantity
+            if seller_quantity and uom and uom != seller.product_uom:
+                seller_quantity = uom._compute_quantity(seller_quantity, seller.product_uom)
+            bracket.append(float_compare(seller_quantity, seller.min_qty, precision_digits=self.precision) >= 0)
+        return tuple(bracket)
+
+    def select_seller(self, product, quantity, uom):
+        key = (product.id, uom.id, self.date, self._quantity_bracket(product, quantity, uom))
+        if key not in self.seller_cache:
+            self.seller_cache[key] = self._select_seller(product, quantity, uom)
+        return self.seller_cache[key]
+
+    def _select_seller(self, product, quantity, uom):
+        # product._select_seller over the rows read in __init__
+        date = self.date if self.date is not None else fields.Date.context_today(product)
+        res = self.env['product.supplierinfo'].sudo()
+        for seller in self.sellers.get(product.product_tmpl_id.id, []):
+            seller_quantity = quantity
+            if seller_quantity and uom and uom != seller.product_uom:
+                seller_quantity = uom._compute_quantity(seller_quantity, seller.product_uom)
+            if seller.date_start and seller.date_start > date:
+                continue
+            if seller.date_end and seller.date_end < date:
+                continue
+            if self.partner and seller.partner_id not in [self.partner, self.partner.parent_id]:
+                continue
+            if quantity is not None and float_compare(
+                    seller_quantity, seller.min_qty, precision_digits=self.precision) == -1:
+                continue
+            if seller.product_id and seller.product_id != product:
+                continue
+            if not res or res.partner_id == seller.partner_id:
+                res |= seller
+        return res.sorted('price')[:1].with_env(product.env)
+
+    def fix_tax_included_price(self, price, product_taxes, line_taxes, company, sudo=False):
+        key = (price, tuple(product_taxes.ids), tuple(line_taxes.ids), company.id, sudo)
+        if key not in self.price_cache:
+            AccountTax = self.env['account.tax'].sudo() if sudo else self.env['account.tax']
+            self.price_cache[key] = AccountTax._fix_tax_included_price_company(
+                price, product_taxes, line_taxes, company)
+        return self.price_cache[key]
+
+    def convert(self, amount, from_currency, to_currency, company, date):
+        """Same result as ``from_currency._convert(amount, to_currency, company, date)``"""
+        if from_currency == to_currency:
+            return to_currency.round(amount)
+        if not amount:
+            return 0.0
+        key = (from_currency.id, to_currency.id, company.id, date)
+        if key not in self.rate_cache:
+            self.rate_cache[key] = self.env['res.currency']._get_conversion_rate(
+                from_currency, to_currency, company, date)
+        return to_currency.round(amount * self.rate_cache[key])
 
 
 class createpurchaseorder(models.TransientModel):
@@ -13,7 +108,10 @@ class createpurchaseorder(models.TransientModel):
     _description = "Create Purchase Order"
 
     new_order_line_ids = fields.One2many('getsale.orderdata', 'new_order_line_id', string="Order Line")
-    partner_id = fields.Many2one('res.partner', string='Vendor', required=True)
+    partner_id = fields.Many2one('res.partner', string='Vendor')
+    split_by_vendor = fields.Boolean(string='Split by Preferred Vendor',
+                                     help="Create one purchase order per preferred vendor of the products "
+                                          "instead of a single order for the selected vendor.")
     date_order = fields.Datetime(string='Order Date', required=True, copy=False, default=fields.Datetime.now)
 
     @api.model
@@ -36,103 +134,143 @@ class createpurchaseorder(models.TransientModel):
 
     def action_create_purchase_order(self):
         self.ensure_one()
-        res = self.env['purchase.order'].browse(self._context.get('id', []))
-        value = []
-        so = self.env['sale.order'].browse(self._context.get('active_id'))
-        pricelist = self.partner_id.property_product_pricelist
-        partner_pricelist = self.partner_id.property_product_pricelist
-        sale_order_name = so.name
+        if not self.split_by_vendor and not self.partner_id:
+            raise UserError(_("Please select a vendor or split the lines by preferred vendor."))
         company_id = self.env.company
+        lines = self.new_order_line_ids
+        # Prefetch the product data every line needs in a few queries
+        products = lines.mapped('product_id')
+        products.mapped('supplier_taxes_id')
+        products.mapped('uom_po_id')
+        products.mapped('uom_id')
 
-        if self.partner_id.property_purchase_currency_id :
-            currency_id = self.partner_id.property_purchase_currency_id.id
+        if self.split_by_vendor:
+            vendor_lines = self._group_lines_by_preferred_vendor(lines)
         else:
-            currency_id = self.env.company.currency_id.id
-
-        purchase_order = res.create({
-            'partner_id': self.partner_id.id,
-            'date_order': str(self.date_order),
-            'origin': sale_order_name,
-            'partner_ref': sale_order_name,
-            'currency_id': currency_id
-        })
-        sale_order = self.env['sale.order'].browse(self._context.get('active_ids', []))
-        message = "Purchase Order created "+'<a href="#" data-oe-id=' + str(
-            purchase_order.id) + ' data-oe-model="purchase.order">@' + purchase_order.name + '</a>'
-        sale_order.message_post(body=message)
-        for data in self.new_order_line_ids:
-            sale_order_name = data.order_id.name
-            if not sale_order_name:
-                sale_order_name = so.name
+            vendor_lines = {self.partner_id: lines}
+
+        order_values = []
+        for vendor, order_lines in vendor_lines.items():
+            origin = ', '.join(order_lines.mapped('order_id').mapped('name'))
+            if vendor.property_purchase_currency_id:
+                currency_id = vendor.property_purchase_currency_id.id
+            else:
+                currency_id = company_id.currency_id.id
+            order_values.append({
+                'partner_id': vendor.id,
+                'date_order': str(self.date_order),
+                'origin': origin,
+                'partner_ref': origin,
+                'currency_id': currency_id
+            })
+        purchase_orders = self.env['purchase.order'].create(order_values)
+
+        line_values = []
+        sale_purchase_orders = {}
+        for purchase_order, order_lines in zip(purchase_orders, vendor_lines.values()):
+            line_values += self._prepare_purchase_order_lines(purchase_order, order_lines)
+            for sale_order in order_lines.mapped('order_id'):
+                sale_purchase_orders[sale_order] = sale_purchase_orders.get(sale_order, purchase_orders.browse()) | purchase_order
+
+        # All lines in one batch: a single INSERT and one recompute of the order totals
+        self.env['purchase.order.line'].create(line_values)
+
+        for sale_order, order_purchases in sale_purchase_orders.items():
+            message = Markup("Purchase Order created ") + Markup(', ').join(
+                Markup('<a href="#" data-oe-id="%s" data-oe-model="purchase.order">@%s</a>') % (purchase.id, purchase.name)
+                for purchase in order_purchases
+            )
+            sale_order.message_post(body=message)
+
+        return purchase_orders
+
+    def _group_lines_by_preferred_vendor(self, lines):
+        """Wizard lines per preferred vendor, the partner of the first valid supplier info of their product"""
+        seller_date = self.date_order and self.date_order.date()
+        # Any vendor: one search for all the products, one selection per product, UoM and quantity bracket
+        resolver = PurchasePriceResolver(self.env, lines.mapped('product_id'), self.env['res.partner'], seller_date)
+        vendor_lines = {}
+        missing = self.env['product.product']
+        for data in lines:
+            product = data.product_id
+            purchase_qty_uom = data.product_uom._compute_quantity(data.product_qty, product.uom_po_id)
+            seller = resolver.select_seller(product, purchase_qty_uom, product.uom_po_id)
+            if not seller:
+                missing |= product
+                continue
+            vendor = seller.partner_id
+            vendor_lines[vendor] = vendor_lines.get(vendor, lines.browse()) | data
+        if missing:
+            raise UserError(_("No vendor is defined for the following products:\n%s")
+                            % '\n'.join(missing.mapped('display_name')))
+        return vendor_lines
+
+    def _prepare_purchase_order_lines(self, purchase_order, lines):
+        """Values of the purchase order lines of ``purchase_order`` converted from the wizard ``lines``"""
+        company_id = self.env.company
+        fpos = purchase_order.fiscal_position_id
+        seller_date = purchase_order.date_order and purchase_order.date_order.date()
+        resolver = PurchasePriceResolver(self.env, lines.mapped('product_id'), purchase_order.partner_id, seller_date)
+        sale_rate_date = self.date_order or fields.Date.today()
+        purchase_rate_date = fields.datetime.today()
+        # Mapped supplier taxes of the company, once per product
+        product_taxes = {}
+
+        line_values = []
+        for data in lines:
+            product = data.product_id
             product_quantity = data.product_qty
 
-            purchase_qty_uom = data.product_uom._compute_quantity(product_quantity, data.product_id.uom_po_id)
+            purchase_qty_uom = data.product_uom._compute_quantity(product_quantity, product.uom_po_id)
 
             # determine vendor (real supplier, sharing the same partner as the one from the PO, but with more accurate informations like validity, quantity, ...)
             # Note: one partner can have multiple supplier info for the same product
-            supplierinfo = data.product_id._select_seller(
-                partner_id=purchase_order.partner_id,
-                quantity=purchase_qty_uom,
-                date=purchase_order.date_order and purchase_order.date_order.date(),
-                # and purchase_order.date_order[:10],
-                uom_id=data.product_id.uom_po_id
-            )
-            fpos = purchase_order.fiscal_position_id
-            taxes = fpos.map_tax(data.product_id.supplier_taxes_id)
-            if taxes:
-                taxes = taxes.filtered(lambda t: t.company_id.id == company_id.id)
+            supplierinfo = resolver.select_seller(product, purchase_qty_uom, product.uom_po_id)
+            if product.id not in product_taxes:
+                taxes = fpos.map_tax(product.supplier_taxes_id)
+                if taxes:
+                    taxes = taxes.filtered(lambda t: t.company_id.id == company_id.id)
+                product_taxes[product.id] = taxes
+            taxes = product_taxes[product.id]
             if not supplierinfo:
-                po_line_uom = data.product_uom or data.product_id.uom_po_id
-                price_unit = self.env['account.tax']._fix_tax_included_price_company(
-                    data.product_id.uom_id._compute_price(data.product_id.standard_price, po_line_uom),
-                    data.product_id.supplier_taxes_id,
+                po_line_uom = data.product_uom or product.uom_po_id
+                price_unit = resolver.fix_tax_included_price(
+                    product.uom_id._compute_price(product.standard_price, po_line_uom),
+                    product.supplier_taxes_id,
                     taxes,
                     company_id,
                 )
                 if price_unit and data.order_id.currency_id and data.order_id.company_id.currency_id != data.order_id.currency_id:
-                    price_unit = data.order_id.company_id.currency_id._convert(
+                    price_unit = resolver.convert(
                         price_unit,
+                        data.order_id.company_id.currency_id,
                         data.order_id.currency_id,
                         data.order_id.company_id,
-                        self.date_order or fields.Date.today(),
+                        sale_rate_date,
                     )
 
             # compute unit price
             if supplierinfo:
-                price_unit = self.env['account.tax'].sudo()._fix_tax_included_price_company(supplierinfo.price,
-                                                                                            data.product_id.supplier_taxes_id,
-                                                                                            taxes, company_id)
+                price_unit = resolver.fix_tax_included_price(supplierinfo.price, product.supplier_taxes_id,
+                                                             taxes, company_id, sudo=True)
                 if purchase_order.currency_id and supplierinfo.currency_id != purchase_order.currency_id:
-                    price_unit = supplierinfo.currency_id._convert(price_unit, purchase_order.currency_id,
-                                                                   purchase_order.company_id, fields.datetime.today()) 
-
-            if self.partner_id.property_purchase_currency_id :
-
-                value = {
-                    'product_id': data.product_id.id,
-                    'name': data.name,
-                    'product_qty': data.product_qty,
-                    'order_id': purchase_order.id,
-                    'product_uom': data.product_uom.id,
-                    'taxes_id': data.product_id.supplier_taxes_id.ids,
-                    'date_planned': data.date_planned,
-                }
-            else:
-                value = {
-                    'product_id': data.product_id.id,
-                    'name': data.name,
-                    'product_qty': data.product_qty,
-                    'order_id': purchase_order.id,
-                    'product_uom': data.product_uom.id,
-                    'taxes_id': data.product_id.supplier_taxes_id.ids,
-                    'date_planned': data.date_planned,
-                    'price_unit': price_unit,
-                }
-
-            self.env['purchase.order.line'].create(value)
+                    price_unit = resolver.convert(price_unit, supplierinfo.currency_id, purchase_order.currency_id,
+                                                  purchase_order.company_id, purchase_rate_date)
 
-        return purchase_order
+            value = {
+                'product_id': product.id,
+                'name': data.name,
+                'product_qty': data.product_qty,
+                'order_id': purchase_order.id,
+                'product_uom': data.product_uom.id,
+                'taxes_id': product.supplier_taxes_id.ids,
+                'date_planned': data.date_planned,
+            }
+            if not purchase_order.partner_id.property_purchase_currency_id:
+                value['price_unit'] = price_unit
+            line_values.append(value)
 
+        return line_values
 
 class Getsaleorderdata(models.TransientModel):
     _name = 'getsale.orderdata'
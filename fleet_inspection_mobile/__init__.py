@@ -1,4 +1,7 @@
+from . import cli
+from . import controllers
 from . import models
+from . import wizard
 
 def post_init_hook(cr, registry):
     """Post-installation hook to create default inspection template"""
@@ -1,7 +1,7 @@
 # -*- coding: utf-8 -*-
 {
     'name': 'Fleet Vehicle Inspection Mobile',
-    'version': '16.0.1.0.0',
+    'version': '16.0.1.1.0',
     'category': 'Fleet',
     'summary': 'Mobile-optimized vehicle inspection addon for Odoo Fleet module',
     'description': """
@@ -21,7 +21,7 @@ with a digital, user-friendly interface. Features:
     """,
     'author': 'ItPatagon',
     'website': 'https://www.itpatagon.com',
-    'depends': ['base', 'web', 'fleet', 'mail'],
+    'depends': ['base', 'web', 'bus', 'fleet', 'mail'],
     'images': ['static/description/icon.png'],
     'data': [
         'security/inspection_security.xml',
@@ -29,14 +29,29 @@ with a digital, user-friendly interface. Features:
         'data/vehicle_data.xml',
         'data/inspection_template_data.xml',
         'data/inspection_items_data.xml',
+        'data/inspection_digest_templates.xml',
+        'data/ir_cron.xml',
         'views/vehicle_views.xml',
         'views/inspection_views.xml',
         'views/inspection_mobile.xml',
+        'views/inspection_board.xml',
+        'views/inspection_item_stats_views.xml',
+        'wizard/inspection_export_wizard_views.xml',
+        'wizard/inspection_import_wizard_views.xml',
+        'wizard/template_import_wizard_views.xml',
         'views/menu.xml',
     ],
     'assets': {
         'web.assets_backend': [
+            'fleet_inspection_mobile/static/src/js/inspection_mobile_loader.js',
+            'fleet_inspection_mobile/static/src/scss/inspection_board.scss',
+            'fleet_inspection_mobile/static/src/js/inspection_board.js',
+            'fleet_inspection_mobile/static/src/xml/inspection_board.xml',
+        ],
+        # Mobile client, loaded on demand by inspection_mobile_loader.js
+        'fleet_inspection_mobile.assets_mobile': [
             'fleet_inspection_mobile/static/src/scss/inspection_mobile.scss',
+            'fleet_inspection_mobile/static/src/js/photo_resize.js',
             'fleet_inspection_mobile/static/src/js/inspection_client_action.js',
             'fleet_inspection_mobile/static/src/xml/inspection_client_action.xml',
             'fleet_inspection_mobile/static/src/xml/inspection_templates.xml',
@@ -0,0 +1,57 @@
+# -*- coding: utf-8 -*-
+import argparse
+import logging
+import sys
+
+import odoo
+from odoo import api, SUPERUSER_ID
+from odoo.cli import Command
+
+from ..tools.inspection_import import InspectionImporter, iter_file_rows
+
+_logger = logging.getLogger(__name__)
+
+
+class FleetInspectionImport(Command):
+    """Import historical inspections from a CSV/XLSX file"""
+    name = 'fleet_inspection_import'
+
+    def run(self, cmdargs):
+        parser = argparse.ArgumentParser(
+            prog=f'{sys.argv[0].split("/")[-1]} {self.name}',
+            description=self.__doc__,
+        )
+        parser.add_argument('-c', '--config', dest='config', help="Odoo configuration file")
+        parser.add_argument('-d', '--database', dest='database', required=True, help="Database name")
+        parser.add_argument('--template', dest='template', help="Template name (default: company template)")
+        parser.add_argument('--batch-size', dest='batch_size', type=int, default=500,
+                            help="Inspections written (and committed) per batch")
+        parser.add_argument('file', help="CSV or XLSX file")
+        args = parser.parse_args(cmdargs)
+
+        config_args = ['-d', args.database]
+        if args.config:
+            config_args += ['-c', args.config]
+        odoo.tools.config.parse_config(config_args)
+
+        registry = odoo.registry(args.database)
+        with registry.cursor() as cr:
+            env = api.Environment(cr, SUPERUSER_ID, {})
+            Template = env['fleet.inspection.template']
+            if args.template:
+                template = Template.search([('name', '=', args.template)], limit=1)
+            else:
+                template = Template.browse(env.company._get_inspection_policy().template_id) \
+                    or Template.search([('active', '=', True)], limit=1)
+            if not template:
+                sys.exit("Inspection template not found")
+
+            with open(args.file, 'rb') as binary_file:
+                importer = InspectionImporter(env, template, batch_size=args.batch_size, commit=True)
+                importer.run(iter_file_rows(binary_file, args.file))
+
+        print(f"Imported {importer.inspection_count} inspections ({importer.line_count} items)")
+        if importer.error_count:
+            print(f"{importer.error_count} rows with errors:")
+            for error in importer.errors:
+                print(f"  {error}")
@@ -0,0 +1,86 @@
+# -*- coding: utf-8 -*-
+import json
+
+from werkzeug.exceptions import BadRequest
+
+from odoo import fields, http
+from odoo.http import content_disposition, request, Response
+from odoo.modules.module import get_manifest
+from odoo.tools import file_open
+
+try:
+    import yaml
+except ImportError:
+    yaml = None
+
+from ..tools.inspection_export import (
+    export_domain, iter_csv_export, iter_export_rows, iter_xlsx_export,
+)
+
+SERVICE_WORKER_PATH = 'fleet_inspection_mobile/static/src/sw/service_worker.js'
+
+
+class FleetInspectionMobileController(http.Controller):
+
+    @http.route('/fleet_inspection_mobile/sw.js', type='http', auth='public', methods=['GET'])
+    def service_worker(self):
+        """Serve the app shell service worker from a path allowed to control /web"""
+        with file_open(SERVICE_WORKER_PATH) as worker_file:
+            body = worker_file.read()
+        version = get_manifest('fleet_inspection_mobile')['version']
+        body = body.replace('__CACHE_VERSION__', version)
+        return request.make_response(body, headers=[
+            ('Content-Type', 'text/javascript; charset=utf-8'),
+            ('Service-Worker-Allowed', '/web'),
+            ('Cache-Control', 'no-cache'),
+        ])
+
+    @http.route('/fleet_inspection_mobile/export', type='http', auth='user', methods=['GET'])
+    def export_inspections(self, file_format='csv', vehicle_id=None, date_from=None, date_to=None,
+                           state=None, overall_status=None, **kwargs):
+        """Stream inspections with their lines and photo URLs as CSV or XLSX"""
+        if vehicle_id and not vehicle_id.isdigit():
+            raise BadRequest("vehicle_id must be an integer")
+        for date in (date_from, date_to):
+            try:
+                fields.Date.to_date(date or None)
+            except ValueError:
+                raise BadRequest(f"Invalid date: {date}")
+        domain = export_domain(vehicle_id, date_from, date_to, state, overall_status)
+        # The generator outlives the request cursor and opens its own
+        rows = iter_export_rows(request.env.registry, request.env.uid, dict(request.env.context), domain)
+        filename = f"inspecciones_{fields.Date.today()}"
+        if file_format == 'xlsx':
+            body = iter_xlsx_export(rows)
+            content_type = 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+            filename += '.xlsx'
+        else:
+            body = iter_csv_export(rows)
+            content_type = 'text/csv; charset=utf-8'
+            filename += '.csv'
+        return Response(body, headers=[
+            ('Content-Type', content_type),
+            ('Content-Disposition', content_disposition(filename)),
+        ], direct_passthrough=True)
+
+    @http.route('/fleet_inspection_mobile/template/<int:template_id>/export', type='http', auth='user', methods=['GET'])
+    def export_template(self, template_id, file_format='json', **kwargs):
+        """Download a whole inspection template as JSON or YAML"""
+        if file_format not in ('json', 'yaml'):
+            raise BadRequest(f"Unsupported format: {file_format}")
+        if file_format == 'yaml' and yaml is None:
+            raise BadRequest("PyYAML is required to export YAML files")
+        template = request.env['fleet.inspection.template'].browse(template_id)
+        template.check_access_rights('read')
+        template.check_access_rule('read')
+        data = template._export_template_data()
+        if file_format == 'yaml':
+            body = yaml.safe_dump(data, allow_unicode=True, sort_keys=False)
+            content_type = 'application/yaml; charset=utf-8'
+        else:
+            body = json.dumps(data, indent=2, ensure_ascii=False)
+            content_type = 'application/json; charset=utf-8'
+        return request.make_response(body, headers=[
+            ('Content-Type', content_type),
+            ('Content-Disposition', content_disposition(f"{template.name}.{file_format}")),
+        ])
@@ -0,0 +1,45 @@
+# -*- coding: utf-8 -*-
+import logging
+
+from odoo import api, SUPERUSER_ID
+
+_logger = logging.getLogger(__name__)
+
+
+def migrate(cr, version):
+    """Move legacy PNG signatures to the ``*_signature_data`` fields.
+
+    Signatures used to be binary fields stored as attachments on
+    ``driver_signature`` / ``supervisor_signature``; they now live in
+    ``*_signature_data`` attachments and the PNG is rendered on demand.
+    The attachments are repointed in place. Installs where the old fields
+    were plain columns (``attachment=False``) are moved through the ORM.
+    """
+    env = api.Environment(cr, SUPERUSER_ID, {})
+    for role in ('driver', 'supervisor'):
+        field_name = f'{role}_signature'
+        cr.execute("""
+            UPDATE ir_attachment a
+               SET res_field = %s, name = %s
+             WHERE a.res_model = 'fleet.inspection' AND a.res_field = %s
+               AND NOT EXISTS (
+                    SELECT 1 FROM ir_attachment b
+                     WHERE b.res_model = 'fleet.inspection' AND b.res_field = %s AND b.res_id = a.res_id
+               )
+        """, [f'{field_name}_data', f'{field_name}_data', field_name, f'{field_name}_data'])
+        _logger.info("Moved %s legacy %s signature attachments", cr.rowcount, role)
+
+        cr.execute("""
+            SELECT 1 FROM information_schema.columns
+             WHERE table_name = 'fleet_inspection' AND column_name = %s
+        """, [field_name])
+        if not cr.fetchone():
+            continue
+        cr.execute(f'SELECT id, "{field_name}" FROM fleet_inspection WHERE "{field_name}" IS NOT NULL')
+        rows = cr.fetchall()
+        for inspection_id, data in rows:
+            env['fleet.inspection'].browse(inspection_id).write({
+                f'{field_name}_data': bytes(data),
+            })
+        cr.execute(f'ALTER TABLE fleet_inspection DROP COLUMN "{field_name}"')
+        _logger.info("Moved %s legacy %s signatures to attachments", len(rows), role)
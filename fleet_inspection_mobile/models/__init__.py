@@ -1,6 +1,13 @@
 from . import fleet_vehicle_extension
 from . import inspection
 from . import inspection_item
+from . import inspection_audit
+from . import inspection_item_stats
 from . import inspection_template
 from . import inspection_photo
-from . import res_company
\ No newline at end of file
+from . import inspection_depot
+from . import inspection_digest
+from . import inspection_assignment
+from . import res_company
+from . import res_users
+from . import ir_websocket
@@ -1,5 +1,9 @@
 # -*- coding: utf-8 -*-
 from odoo import models, fields, api
+from odoo.exceptions import AccessError
+
+# A vehicle needs a new inspection when its last completed one is this old
+INSPECTION_DUE_DAYS = 30
 
 
 class FleetVehicleInspectionExtension(models.Model):
@@ -19,45 +23,145 @@ class FleetVehicleInspectionExtension(models.Model):
 
     @api.depends('inspection_ids', 'inspection_ids.state', 'inspection_ids.inspection_date')
     def _compute_inspection_stats(self):
+        stats = self._get_completed_inspection_stats()
+        now = fields.Datetime.now()
         for vehicle in self:
-            completed_inspections = vehicle.inspection_ids.filtered(lambda i: i.state == 'completed')
-            vehicle.inspection_count = len(completed_inspections)
-            
-            if completed_inspections:
-                latest = completed_inspections.sorted('inspection_date', reverse=True)[0]
-                vehicle.last_inspection_id = latest
-                vehicle.last_inspection_date = latest.inspection_date
-                
-                if latest.inspection_date:
-                    delta = fields.Datetime.now() - latest.inspection_date
-                    vehicle.days_since_inspection = delta.days
-                else:
-                    vehicle.days_since_inspection = 999
-            else:
-                vehicle.last_inspection_id = False
-                vehicle.last_inspection_date = False
-                vehicle.days_since_inspection = 999
+            count, latest_id, latest_date = stats.get(vehicle._origin.id, (0, False, False))
+            vehicle.inspection_count = count
+            vehicle.last_inspection_id = latest_id
+            vehicle.last_inspection_date = latest_date
+            vehicle.days_since_inspection = (now - latest_date).days if latest_date else 999
 
     @api.depends('days_since_inspection')
     def _compute_inspection_due(self):
         for vehicle in self:
-            vehicle.inspection_due = vehicle.days_since_inspection >= 30
+            vehicle.inspection_due = vehicle.days_since_inspection >= INSPECTION_DUE_DAYS
+
+    def _get_completed_inspection_stats(self):
+        """Count and latest completed inspection per vehicle in a single query"""
+        vehicle_ids = self._origin.ids
+        if not vehicle_ids:
+            return {}
+        self.env['fleet.inspection'].flush_model(['vehicle_id', 'state', 'inspection_date'])
+        self.env.cr.execute("""
+            SELECT DISTINCT ON (vehicle_id)
+                   vehicle_id,
+                   COUNT(*) OVER (PARTITION BY vehicle_id),
+                   id,
+                   inspection_date
+              FROM fleet_inspection
+             WHERE state = 'completed' AND vehicle_id IN %s
+          ORDER BY vehicle_id, inspection_date DESC, id DESC
+        """, [tuple(vehicle_ids)])
+        return {row[0]: row[1:] for row in self.env.cr.fetchall()}
+
+    @api.model
+    def get_fleet_status_board(self, company_ids=None, model_ids=None, due_state=None):
+        """Latest inspection status of every vehicle for the supervisor board.
+
+        Backed by one ``DISTINCT ON (vehicle_id)`` query so the whole fleet is
+        served in a single request instead of computing
+        ``last_inspection_id`` vehicle by vehicle.
+
+        :param company_ids: restrict to vehicles of these companies
+        :param model_ids: restrict to these vehicle models
+        :param due_state: ``'due'`` or ``'ok'`` to filter on inspection due
+        """
+        if not self.env.user.has_group('fleet_inspection_mobile.group_fleet_inspection_manager'):
+            raise AccessError("Solo los responsables de inspecciones pueden ver el tablero de flota.")
+
+        domain = []
+        if company_ids:
+            domain.append(('company_id', 'in', company_ids))
+        if model_ids:
+            domain.append(('model_id', 'in', model_ids))
+        vehicle_query = self._search(domain)
+        vehicle_sql, vehicle_params = vehicle_query.subselect()
+
+        due_clause = ''
+        if due_state == 'due':
+            due_clause = "AND (latest.inspection_date IS NULL OR latest.inspection_date <= NOW() AT TIME ZONE 'UTC' - make_interval(days => %s))"
+        elif due_state == 'ok':
+            due_clause = "AND latest.inspection_date > NOW() AT TIME ZONE 'UTC' - make_interval(days => %s)"
+
+        self.flush_model(['name', 'license_plate', 'model_id', 'company_id'])
+        self.env['fleet.inspection'].flush_model([
+            'vehicle_id', 'state', 'inspection_date', 'overall_status',
+            'items_good', 'items_regular', 'items_bad', 'items_na', 'total_items',
+        ])
+        query = f"""
+            WITH latest AS (
+                SELECT DISTINCT ON (vehicle_id)
+                       vehicle_id, id, inspection_date, overall_status
+                  FROM fleet_inspection
+                 WHERE state = 'completed' AND vehicle_id IN ({vehicle_sql})
+              ORDER BY vehicle_id, inspection_date DESC, id DESC
+            ), current AS (
+                SELECT DISTINCT ON (vehicle_id)
+                       vehicle_id, id,
+                       items_good + items_regular + items_bad + items_na AS completed,
+                       total_items
+                  FROM fleet_inspection
+                 WHERE state = 'draft' AND vehicle_id IN ({vehicle_sql})
+              ORDER BY vehicle_id, inspection_date DESC, id DESC
+            )
+            SELECT v.id, v.name, v.license_plate, v.company_id, v.model_id, m.name,
+                   latest.id, latest.inspection_date, latest.overall_status,
+                   current.id, current.completed, current.total_items
+              FROM fleet_vehicle v
+         LEFT JOIN fleet_vehicle_model m ON m.id = v.model_id
+         LEFT JOIN latest ON latest.vehicle_id = v.id
+         LEFT JOIN current ON current.vehicle_id = v.id
+             WHERE v.id IN ({vehicle_sql}) {due_clause}
+          ORDER BY latest.overall_status = 'maintenance' DESC NULLS LAST,
+                   latest.overall_status = 'attention' DESC NULLS LAST,
+                   v.license_plate, v.id
+        """
+        params = vehicle_params * 3
+        if due_clause:
+            params.append(INSPECTION_DUE_DAYS)
+        self.env.cr.execute(query, params)
+
+        now = fields.Datetime.now()
+        counts = {'good': 0, 'attention': 0, 'maintenance': 0, 'none': 0, 'due': 0}
+        vehicles = []
+        for (vehicle_id, name, plate, company_id, model_id, model_name,
+             last_id, last_date, last_status, draft_id, draft_completed, draft_total) in self.env.cr.fetchall():
+            days = (now - last_date).days if last_date else None
+            due = days is None or days >= INSPECTION_DUE_DAYS
+            counts[last_status or 'none'] += 1
+            counts['due'] += due
+            vehicles.append({
+                'id': vehicle_id,
+                'name': name,
+                'license_plate': plate,
+                'company_id': company_id,
+                'model_id': model_id,
+                'model': model_name,
+                'last_inspection_id': last_id,
+                'last_inspection_date': last_date,
+                'last_inspection_status': last_status,
+                'days_since_inspection': days,
+                'inspection_due': due,
+                'draft_inspection_id': draft_id,
+                'draft_completed': draft_completed or 0,
+                'draft_total': draft_total or 0,
+            })
+        return {'counts': counts, 'vehicles': vehicles}
 
     def action_start_inspection(self):
         """Start new inspection for this vehicle"""
         self.ensure_one()
         
-        # Check if there's already a draft inspection
-        draft_inspection = self.inspection_ids.filtered(lambda i: i.state == 'draft')
-        if draft_inspection:
-            return draft_inspection[0].action_resume_inspection()
-        
-        # Create new inspection
-        inspection = self.env['fleet.inspection'].create({
+        # Atomic start-or-resume, concurrent taps on the same vehicle share the draft
+        result = self.env['fleet.inspection'].start_or_resume({
             'vehicle_id': self.id,
             'driver_id': self.driver_id.id or self.env.user.partner_id.id,
             'vehicle_name': self.display_name,
             'odometer': self.odometer,
         })
+        if not result['created']:
+            return self.env['fleet.inspection']._mobile_resume_action(result['inspection_id'])
         
-        return inspection.action_start_inspection()
\ No newline at end of file
+        inspection = self.env['fleet.inspection'].browse(result['inspection_id'])
+        return inspection.action_start_inspection()
@@ -1,10 +1,45 @@
 # -*- coding: utf-8 -*-
-from odoo import models, fields, api
+from odoo import models, fields, api, tools
 from odoo.exceptions import UserError
+from odoo.tools import mute_logger
+from PIL import Image, ImageDraw
+from psycopg2 import errors as pg_errors
+import base64
+import io
 import logging
+import re
+import time
+
+from ..tools.observation_search import (
+    FTS_CONFIG, TSV_COLUMN, ensure_tsvector_column, matching_inspections_query,
+)
 
 _logger = logging.getLogger(__name__)
 
+SIGNATURE_ROLES = ('driver', 'supervisor')
+SIGNATURE_STROKE_WIDTH = 3
+_SVG_VIEWBOX_RE = re.compile(rb'viewBox="0 0 (\d+) (\d+)"')
+_SVG_PATH_RE = re.compile(rb' d="([^"]*)"')
+_SVG_POINT_RE = re.compile(rb'([ML])(-?\d+) (-?\d+)')
+
+# Live progress events on the bus; see ir_websocket.py for the subscription
+PROGRESS_CHANNEL = 'fleet_inspection_progress'
+
+# Dwell time above this is an abandoned screen, not inspection work
+MAX_ITEM_SECONDS = 900
+
+# Start screen bundles are cached briefly per user, per worker, and
+# revalidated on every call against a stamp of the committed data
+START_SCREEN_CACHE_TTL = 30.0
+START_SCREEN_RECENT_VEHICLES = 5
+# (dbname, uid) -> (monotonic time, company ids, stamp, bundle)
+_start_screen_cache = {}
+
+OBSERVATION_SEARCH_LIMIT = 50
+
+# At most one draft inspection per vehicle, see start_or_resume()
+DRAFT_UNIQUE_INDEX = 'fleet_inspection_vehicle_draft_uniq'
+
 
 class FleetInspection(models.Model):
     _name = 'fleet.inspection'
@@ -25,7 +60,7 @@ class FleetInspection(models.Model):
         ('draft', 'En Progreso'),
         ('completed', 'Completado'),
         ('cancelled', 'Cancelled')
-    ], string='Estado', default='draft', required=True, tracking=True)
+    ], string='Estado', default='draft', required=True)
     
     # Driver information
     license_number = fields.Char(string='License Number')
@@ -41,6 +76,7 @@ class FleetInspection(models.Model):
     
     # Inspection items
     inspection_line_ids = fields.One2many('fleet.inspection.line', 'inspection_id', string='Elementos de Inspección')
+    audit_ids = fields.One2many('fleet.inspection.audit', 'inspection_id', string='Auditoría')
     
     # Summary fields
     items_good = fields.Integer(string='Items - Good', compute='_compute_summary', store=True)
@@ -56,9 +92,16 @@ class FleetInspection(models.Model):
         ('maintenance', 'Requiere Mantenimiento')
     ], string='Estado General', compute='_compute_overall_status', store=True)
     
-    # Signatures
-    driver_signature = fields.Binary(string='Driver Signature')
-    supervisor_signature = fields.Binary(string='Supervisor Signature')
+    # Signatures: strokes are kept as a small SVG in an attachment, the PNG
+    # is only rasterized when something (form, report) actually reads it.
+    # PNGs signed before vector capture, or uploaded from the form, are
+    # stored as is in *_signature_data (the 16.0.1.1.0 migration moved them).
+    driver_signature_data = fields.Binary(string='Driver Signature Data', attachment=True)
+    supervisor_signature_data = fields.Binary(string='Supervisor Signature Data', attachment=True)
+    driver_signature = fields.Binary(string='Driver Signature', compute='_compute_signature_png',
+                                     inverse='_inverse_driver_signature')
+    supervisor_signature = fields.Binary(string='Supervisor Signature', compute='_compute_signature_png',
+                                         inverse='_inverse_supervisor_signature')
     
     observations = fields.Text(string='General Observations')
     
@@ -67,10 +110,72 @@ class FleetInspection(models.Model):
     device_info = fields.Char(string='Device Info')
     start_time = fields.Datetime(string='Start Time')
     end_time = fields.Datetime(string='End Time')
+    # Completed, its item timings not yet folded into the statistics
+    timing_pending = fields.Boolean(string='Timing Pending', readonly=True, copy=False)
     
     # Template reference
     template_id = fields.Many2one('fleet.inspection.template', string='Plantilla de Inspección')
 
+    # Full-text search over the observations of the inspection and its lines
+    observation_search = fields.Char(
+        string='Buscar en Observaciones', compute='_compute_observation_search',
+        search='_search_observation_search',
+    )
+
+    def init(self):
+        # Last completed inspection of a vehicle (carry-forward, fleet board)
+        tools.create_index(
+            self._cr, 'fleet_inspection_vehicle_completed_idx', self._table,
+            ['vehicle_id', 'inspection_date DESC', 'id DESC'], where="state = 'completed'",
+        )
+        # Start screen: the user's drafts and the vehicles they inspected last
+        tools.create_index(
+            self._cr, 'fleet_inspection_user_draft_idx', self._table,
+            ['create_uid'], where="state = 'draft'",
+        )
+        tools.create_index(
+            self._cr, 'fleet_inspection_user_completed_idx', self._table,
+            ['create_uid', 'vehicle_id', 'inspection_date DESC', 'id DESC'], where="state = 'completed'",
+        )
+        # Default list order, date ranges of exports and reports
+        tools.create_index(
+            self._cr, 'fleet_inspection_date_idx', self._table,
+            ['inspection_date DESC', 'id DESC'],
+        )
+        # Statistics cron: inspections whose timings are still to be folded
+        tools.create_index(
+            self._cr, 'fleet_inspection_timing_pending_idx', self._table,
+            ['id'], where="timing_pending",
+        )
+        if not tools.index_exists(self._cr, DRAFT_UNIQUE_INDEX):
+            self._cr.execute("""
+                SELECT vehicle_id FROM fleet_inspection
+                 WHERE state = 'draft'
+              GROUP BY vehicle_id HAVING count(*) > 1
+            """)
+            duplicated = [row[0] for row in self._cr.fetchall()]
+            if duplicated:
+                _logger.warning(
+                    f"Vehicles {duplicated} have several draft inspections, "
+                    f"complete or cancel them to enable {DRAFT_UNIQUE_INDEX}"
+                )
+            else:
+                self._cr.execute(
+                    f'CREATE UNIQUE INDEX "{DRAFT_UNIQUE_INDEX}" ON "{self._table}" (vehicle_id) '
+                    f"WHERE state = 'draft'"
+                )
+        ensure_tsvector_column(self._cr, self._table)
+
+    def _compute_observation_search(self):
+        self.observation_search = False
+
+    def _search_observation_search(self, operator, value):
+        if operator not in ('ilike', '=') or not value:
+            raise UserError("Operación no soportada en la búsqueda de observaciones.")
+        self.flush_model(['observations'])
+        self.env['fleet.inspection.line'].flush_model(['observations', 'inspection_id'])
+        return [('id', 'inselect', matching_inspections_query(value))]
+
     @api.depends('vehicle_id', 'inspection_date')
     def _compute_name(self):
         for record in self:
@@ -115,6 +220,230 @@ class FleetInspection(models.Model):
             else:
                 record.completion_time = 0.0
 
+    @api.depends('driver_signature_data', 'supervisor_signature_data')
+    def _compute_signature_png(self):
+        for record in self:
+            record.driver_signature = record._signature_png(record.driver_signature_data)
+            record.supervisor_signature = record._signature_png(record.supervisor_signature_data)
+
+    def _inverse_driver_signature(self):
+        for record in self:
+            record.driver_signature_data = record.driver_signature
+
+    def _inverse_supervisor_signature(self):
+        # Signatures uploaded from the form are stored as is, _signature_png serves legacy PNGs unchanged
+        for record in self:
+            record.supervisor_signature_data = record.supervisor_signature
+
+    @api.model
+    def _signature_svg(self, strokes, width, height):
+        """Build a compact SVG from pad strokes ([[x, y], ...] per stroke)"""
+        width = max(int(width or 0), 1)
+        height = max(int(height or 0), 1)
+        commands = []
+        for stroke in strokes or []:
+            points = []
+            for point in stroke or []:
+                try:
+                    x = min(max(int(round(float(point[0]))), 0), width)
+                    y = min(max(int(round(float(point[1]))), 0), height)
+                except (TypeError, ValueError, IndexError):
+                    continue
+                # Drop consecutive duplicates, the pad emits plenty of them
+                if not points or points[-1] != (x, y):
+                    points.append((x, y))
+            if not points:
+                continue
+            if len(points) == 1:
+                points.append(points[0])
+            commands.append('M%d %d' % points[0] + ''.join('L%d %d' % p for p in points[1:]))
+        if not commands:
+            return False
+        return (
+            '<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 %d %d" width="%d" height="%d">'
+            '<path d="%s" fill="none" stroke="#000" stroke-width="%d" '
+            'stroke-linecap="round" stroke-linejoin="round"/></svg>'
+        ) % (width, height, width, height, ''.join(commands), SIGNATURE_STROKE_WIDTH)
+
+    @api.model
+    def _signature_png(self, data):
+        """Rasterize stored signature data to a base64 PNG"""
+        if not data:
+            return False
+        raw = base64.b64decode(data)
+        if not raw.lstrip().startswith(b'<svg'):
+            # Legacy signature captured as PNG
+            return data
+        viewbox = _SVG_VIEWBOX_RE.search(raw)
+        path = _SVG_PATH_RE.search(raw)
+        if not viewbox or not path:
+            return False
+        size = (int(viewbox.group(1)), int(viewbox.group(2)))
+        image = Image.new('RGBA', size, (255, 255, 255, 0))
+        draw = ImageDraw.Draw(image)
+        strokes = []
+        for command, x, y in _SVG_POINT_RE.findall(path.group(1)):
+            if command == b'M':
+                strokes.append([])
+            strokes[-1].append((int(x), int(y)))
+        for stroke in strokes:
+            if len(set(stroke)) == 1:
+                # A single tap: draw a dot instead of a zero-length line
+                cx, cy = stroke[0]
+                radius = SIGNATURE_STROKE_WIDTH / 2.0
+                draw.ellipse((cx - radius, cy - radius, cx + radius, cy + radius), fill='black')
+            else:
+                draw.line(stroke, fill='black', width=SIGNATURE_STROKE_WIDTH, joint='curve')
+        output = io.BytesIO()
+        image.save(output, format='PNG', optimize=True)
+        return base64.b64encode(output.getvalue())
+
+    def save_signature(self, strokes, width, height, role='driver'):
+        """Store signature strokes captured by the mobile signature pad"""
+        self.ensure_one()
+        if role not in SIGNATURE_ROLES:
+            raise UserError("Tipo de firma no válido: %s" % role)
+        svg = self._signature_svg(strokes, width, height)
+        self[f'{role}_signature_data'] = base64.b64encode(svg.encode()) if svg else False
+        return bool(svg)
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        # The creation is logged in the audit trail instead of the chatter
+        records = super(FleetInspection, self.with_context(mail_create_nolog=True)).create(vals_list)
+        records = records.with_env(self.env)
+        self.env['fleet.inspection.audit']._log_creation(records)
+        return records
+
+    def write(self, vals):
+        Audit = self.env['fleet.inspection.audit']
+        snapshot = Audit._snapshot(self, vals)
+        res = super().write(vals)
+        Audit._log_changes(self, snapshot)
+        if vals.get('state') == 'completed':
+            self.env['fleet.inspection.assignment']._mark_done(self)
+        if 'state' in vals:
+            self._notify_progress()
+        return res
+
+    @api.model
+    def _get_start_screen_stamp(self):
+        """Fingerprint of the current user's inspections and today's assignments
+
+        Any create, write or unlink changes it, whichever worker or user made
+        it, so a cached bundle is never served once the change is visible.
+        """
+        self.flush_model(['state', 'create_uid', 'write_date'])
+        self.env['fleet.inspection.assignment'].flush_model(['user_id', 'date', 'write_date'])
+        self.env.cr.execute("""
+            SELECT (SELECT row(count(*), max(write_date))::text
+                      FROM fleet_inspection
+                     WHERE create_uid = %s AND state IN ('draft', 'completed')),
+                   (SELECT row(count(*), max(write_date))::text
+                      FROM fleet_inspection_assignment
+                     WHERE user_id = %s AND date = %s)
+        """, [self.env.uid, self.env.uid, fields.Date.context_today(self)])
+        return self.env.cr.fetchone()
+
+    @api.model
+    def get_start_screen_data(self):
+        """Everything the mobile start screen needs in one round trip.
+
+        Returns the user's draft inspections, the last distinct vehicles the
+        user inspected, the vehicles assigned to the user for today and the
+        active templates, plus the mobile settings of the current company. The
+        bundle is cached for a few seconds per user, as long as the stamp of
+        its data is unchanged.
+        """
+        key = (self.env.cr.dbname, self.env.uid)
+        company_ids = tuple(self.env.companies.ids)
+        now = time.monotonic()
+        stamp = self._get_start_screen_stamp()
+        cached = _start_screen_cache.get(key)
+        if (cached and cached[1] == company_ids and cached[2] == stamp
+                and now - cached[0] < START_SCREEN_CACHE_TTL):
+            return cached[3]
+
+        drafts = self.search_read(
+            [('state', '=', 'draft'), ('create_uid', '=', self.env.uid)],
+            ['id', 'name', 'vehicle_id', 'inspection_date', 'completion_percentage'],
+        )
+        templates = self.env['fleet.inspection.template'].search_read(
+            [('active', '=', True)], ['id', 'name'],
+        )
+        bundle = {
+            'drafts': drafts,
+            'recent_vehicles': self._get_recent_vehicles(START_SCREEN_RECENT_VEHICLES),
+            'assigned_vehicles': self.env['fleet.inspection.assignment']._get_start_screen_vehicles(),
+            'templates': templates,
+            'settings': self.env.company._get_inspection_mobile_settings(),
+        }
+
+        if len(_start_screen_cache) > 1000:
+            for cache_key, entry in list(_start_screen_cache.items()):
+                if now - entry[0] >= START_SCREEN_CACHE_TTL:
+                    del _start_screen_cache[cache_key]
+        _start_screen_cache[key] = (now, company_ids, stamp, bundle)
+        return bundle
+
+    @api.model
+    def _get_recent_vehicles(self, limit):
+        """Last ``limit`` distinct vehicles inspected by the current user"""
+        vehicle_sql, vehicle_params = self.env['fleet.vehicle']._search([]).subselect()
+        self.flush_model(['vehicle_id', 'state', 'inspection_date', 'overall_status', 'create_uid'])
+        self.env.cr.execute(f"""
+            SELECT vehicle_id, inspection_date, overall_status
+              FROM (
+                    SELECT DISTINCT ON (vehicle_id) vehicle_id, inspection_date, overall_status
+                      FROM fleet_inspection
+                     WHERE state = 'completed' AND create_uid = %s
+                       AND vehicle_id IN ({vehicle_sql})
+                  ORDER BY vehicle_id, inspection_date DESC, id DESC
+                   ) latest
+          ORDER BY inspection_date DESC
+             LIMIT %s
+        """, [self.env.uid, *vehicle_params, limit])
+        rows = self.env.cr.fetchall()
+        vehicles = self.env['fleet.vehicle'].browse([row[0] for row in rows])
+        vehicles_data = {
+            vehicle['id']: vehicle
+            for vehicle in vehicles.read(['name', 'license_plate', 'driver_id', 'model_id'])
+        }
+        return [
+            dict(vehicles_data[vehicle_id], last_inspection_date=date, last_inspection_status=status)
+            for vehicle_id, date, status in rows
+        ]
+
+    def _notify_progress(self):
+        """Queue a live progress event for these inspections.
+
+        Events are gathered per transaction and sent once at commit time, so
+        a transaction writing many lines of an inspection sends one event.
+        Every committed transaction sends its event; the supervisor board
+        coalesces bursts on its side.
+        """
+        pending = self.env.cr.precommit.data.setdefault('fleet_inspection.progress', set())
+        if not pending:
+            self.env.cr.precommit.add(self._send_progress_notifications)
+        pending.update(self.ids)
+
+    @api.model
+    def _send_progress_notifications(self):
+        pending = self.env.cr.precommit.data.pop('fleet_inspection.progress', set())
+        notifications = []
+        for inspection in self.sudo().browse(pending).exists():
+            company = inspection.vehicle_id.company_id or self.env.company
+            notifications.append(((company, PROGRESS_CHANNEL), 'fleet_inspection/progress', {
+                'inspection_id': inspection.id,
+                'vehicle_id': inspection.vehicle_id.id,
+                'state': inspection.state,
+                'completed': inspection.items_good + inspection.items_regular + inspection.items_bad + inspection.items_na,
+                'total': inspection.total_items,
+                'overall_status': inspection.overall_status,
+            }))
+        if notifications:
+            self.env['bus.bus']._sendmany(notifications)
+
     def action_start_inspection(self):
         """Initialize inspection from template"""
         self.ensure_one()
@@ -140,8 +469,112 @@ class FleetInspection(models.Model):
             'target': 'current',
         }
 
-    def initialize_mobile_inspection(self):
-        """Initialize inspection from template for mobile interface"""
+    @api.model
+    def search_observations(self, query, limit=OBSERVATION_SEARCH_LIMIT):
+        """Ranked full-text search over inspection and line observations
+
+        ``query`` uses web search syntax (quoted phrases, ``or``, ``-word``)
+        with Spanish stemming. Only inspections readable by the user are
+        searched.
+
+        :return: list of matches, best first, with the highlighted snippet
+        """
+        if not (query or '').strip():
+            return []
+        self.flush_model(['observations'])
+        self.env['fleet.inspection.line'].flush_model(['observations', 'inspection_id'])
+        visible_sql, visible_params = self._search([]).subselect()
+        self.env.cr.execute(f"""
+            WITH q AS (SELECT websearch_to_tsquery('{FTS_CONFIG}', %s) AS query)
+            SELECT m.inspection_id, m.line_id, m.rank,
+                   ts_headline('{FTS_CONFIG}', m.observations, q.query, 'MaxFragments=1, MaxWords=20, MinWords=5')
+              FROM (
+                    SELECT i.id AS inspection_id, NULL::int AS line_id, i.observations,
+                           ts_rank_cd(i.{TSV_COLUMN}, q.query) AS rank
+                      FROM fleet_inspection i, q
+                     WHERE i.{TSV_COLUMN} @@ q.query AND i.id IN ({visible_sql})
+                 UNION ALL
+                    SELECT l.inspection_id, l.id, l.observations,
+                           ts_rank_cd(l.{TSV_COLUMN}, q.query)
+                      FROM fleet_inspection_line l, q
+                     WHERE l.{TSV_COLUMN} @@ q.query AND l.inspection_id IN ({visible_sql})
+                   ) m, q
+          ORDER BY m.rank DESC, m.inspection_id DESC
+             LIMIT %s
+        """, [query, *visible_params, *visible_params, limit])
+        rows = self.env.cr.fetchall()
+        inspections = self.browse(row[0] for row in rows)
+        lines = self.env['fleet.inspection.line'].browse(row[1] for row in rows if row[1])
+        names = {inspection.id: inspection for inspection in inspections}
+        items = {line.id: line.name for line in lines}
+        return [{
+            'inspection_id': inspection_id,
+            'inspection': names[inspection_id].name,
+            'vehicle': names[inspection_id].vehicle_id.display_name,
+            'inspection_date': names[inspection_id].inspection_date,
+            'line_id': line_id or False,
+            'item': items.get(line_id, False),
+            'snippet': snippet,
+            'rank': rank,
+        } for inspection_id, line_id, rank, snippet in rows]
+
+    @api.model
+    def search_within_radius(self, latitude, longitude, radius):
+        """Inspections with a photo taken within ``radius`` metres of a point
+
+        :return: list of dicts with ``inspection_id`` and the ``distance`` of its nearest photo
+        """
+        distances = {}
+        for match in self.env['fleet.inspection.photo'].search_within_radius(latitude, longitude, radius):
+            distances.setdefault(match['inspection_id'], match['distance'])
+        return [{'inspection_id': inspection_id, 'distance': distance} for inspection_id, distance in distances.items()]
+
+    @api.model
+    def search_outside_depots(self, date_from=None, date_to=None, company_ids=None):
+        """Ids of the inspections with photos taken away from every depot of their company"""
+        matches = self.env['fleet.inspection.photo'].search_outside_depots(date_from, date_to, company_ids)
+        return list(dict.fromkeys(match['inspection_id'] for match in matches))
+
+    @api.model
+    def start_or_resume(self, vals):
+        """Create a draft inspection for ``vals['vehicle_id']`` or return the existing one
+
+        The partial unique index on drafts makes this atomic: when another
+        transaction inserts the vehicle's draft first, our insert waits for
+        it, fails on the index and we return the winner's draft instead of
+        creating a second one or retrying the whole transaction.
+
+        :return: dict with the draft ``inspection_id`` and whether it was ``created``
+        """
+        vehicle_id = vals['vehicle_id']
+        draft = self.search([('vehicle_id', '=', vehicle_id), ('state', '=', 'draft')], limit=1)
+        if draft:
+            return {'inspection_id': draft.id, 'created': False}
+        try:
+            with mute_logger('odoo.sql_db'), self.env.cr.savepoint():
+                inspection = self.create(dict(vals, state='draft'))
+        except pg_errors.UniqueViolation:
+            # The concurrent draft committed after our snapshot was taken, only
+            # a new transaction can see it
+            self.env.invalidate_all()
+            with self.pool.cursor() as cr:
+                cr.execute(
+                    "SELECT id FROM fleet_inspection WHERE vehicle_id = %s AND state = 'draft'",
+                    [vehicle_id],
+                )
+                row = cr.fetchone()
+            if not row:
+                raise
+            _logger.info(f"Concurrent start on vehicle {vehicle_id}, resuming inspection {row[0]}")
+            return {'inspection_id': row[0], 'created': False}
+        return {'inspection_id': inspection.id, 'created': True}
+
+    def initialize_mobile_inspection(self, carry_forward=None):
+        """Initialize inspection from template for mobile interface
+
+        :param carry_forward: pre-fill the lines with the vehicle's last
+            completed inspection; defaults to the company setting
+        """
         self.ensure_one()
         
         if not self.start_time:
@@ -155,28 +588,90 @@ class FleetInspection(models.Model):
         
         # Create inspection lines from template
         if not self.inspection_line_ids:
-            self._create_inspection_lines()
+            if carry_forward is None:
+                carry_forward = self._get_inspection_policy().carry_forward
+            self._create_inspection_lines(carry_forward=carry_forward)
         
         return True
 
-    def _create_inspection_lines(self):
+    def _create_inspection_lines(self, carry_forward=False):
         """Create inspection lines from template items"""
         if not self.template_id:
             return
-            
+
+        previous_statuses = self._get_previous_statuses() if carry_forward else {}
         lines_vals = []
         for item in self.template_id.item_ids:
+            status = previous_statuses.get(item.id, False)
             lines_vals.append({
                 'inspection_id': self.id,
                 'template_item_id': item.id,
-                'status': False,  # Will be set during inspection
+                'status': status,  # Will be set during inspection unless carried forward
+                'needs_confirmation': bool(status) and status != 'bien',
             })
         
-        self.env['fleet.inspection.line'].create(lines_vals)
+        try:
+            with mute_logger('odoo.sql_db'), self.env.cr.savepoint():
+                self.env['fleet.inspection.line'].create(lines_vals)
+        except pg_errors.UniqueViolation:
+            # Another request initialized the same draft concurrently
+            self.env.invalidate_all()
+            _logger.info(f"Lines of inspection {self.id} were created concurrently")
+
+    def _get_previous_statuses(self):
+        """Statuses of the vehicle's last completed inspection, by template item"""
+        self.ensure_one()
+        self.flush_model(['vehicle_id', 'state', 'inspection_date'])
+        self.env['fleet.inspection.line'].flush_model(['inspection_id', 'template_item_id', 'status'])
+        self.env.cr.execute("""
+            SELECT template_item_id, status
+              FROM fleet_inspection_line
+             WHERE status IS NOT NULL
+               AND inspection_id = (
+                    SELECT id FROM fleet_inspection
+                     WHERE vehicle_id = %s AND state = 'completed'
+                  ORDER BY inspection_date DESC, id DESC
+                     LIMIT 1
+               )
+        """, [self.vehicle_id.id])
+        return dict(self.env.cr.fetchall())
+
+    def record_item_timings(self, timings):
+        """Add the dwell times measured by the mobile client to the lines.
+
+        :param timings: list of ``{'line_id': id, 'seconds': float}``, a line
+            may appear several times when the inspector went back to it
+        """
+        self.ensure_one()
+        if self.state != 'draft':
+            return False
+        seconds_by_line = {}
+        for timing in timings:
+            seconds = min(max(float(timing['seconds']), 0.0), MAX_ITEM_SECONDS)
+            seconds_by_line[timing['line_id']] = seconds_by_line.get(timing['line_id'], 0.0) + seconds
+        if not seconds_by_line:
+            return True
+        # Increment in SQL: batches of the same inspection may arrive concurrently
+        Line = self.env['fleet.inspection.line']
+        Line.flush_model(['time_spent'])
+        self.env.cr.execute("""
+            UPDATE fleet_inspection_line l
+               SET time_spent = COALESCE(l.time_spent, 0) + t.seconds
+              FROM unnest(%s::int[], %s::float8[]) AS t(id, seconds)
+             WHERE l.id = t.id AND l.inspection_id = %s
+        """, [list(seconds_by_line), list(seconds_by_line.values()), self.id])
+        Line.invalidate_model(['time_spent'])
+        return True
+
+    def _get_inspection_policy(self):
+        """Inspection policy of the vehicle's company (current company as fallback)"""
+        company = self.vehicle_id.company_id or self.env.company
+        return company._get_inspection_policy()
 
     def action_complete_inspection(self):
         """Mark inspection as completed"""
         self.ensure_one()
+        policy = self._get_inspection_policy()
         
         try:
             _logger.info(f"=== STARTING COMPLETION FOR INSPECTION {self.id} ===")
@@ -194,11 +689,13 @@ class FleetInspection(models.Model):
             
             # Check required odometer reading
             try:
-                odometer_required = hasattr(self.env.company, 'inspection_require_odometer') and self.env.company.inspection_require_odometer
+                odometer_required = policy.require_odometer
                 _logger.info(f"Odometer required: {odometer_required}, Current odometer: {self.odometer}")
                 if odometer_required and not self.odometer:
                     _logger.error("COMPLETION FAILED: Odometer required but not set")
                     raise UserError("La lectura del odómetro es requerida para completar la inspección.")
+            except UserError:
+                raise
             except Exception as e:
                 _logger.warning(f"Error checking odometer requirement: {e}")
             
@@ -206,8 +703,8 @@ class FleetInspection(models.Model):
             all_lines = self.inspection_line_ids
             _logger.info(f"Checking {len(all_lines)} inspection lines for completion...")
             
-            incomplete_items = all_lines.filtered(lambda l: not l.status)
-            completed_items = all_lines.filtered(lambda l: l.status)
+            incomplete_items = all_lines.filtered(lambda l: not l.status or l.needs_confirmation)
+            completed_items = all_lines - incomplete_items
             
             _logger.info(f"Completed items: {len(completed_items)}")
             _logger.info(f"Incomplete items: {len(incomplete_items)}")
@@ -222,7 +719,7 @@ class FleetInspection(models.Model):
             
             # Check required photos (only if photo functionality is configured)
             try:
-                photo_required = hasattr(self.env.company, 'inspection_require_photo_for_bad') and self.env.company.inspection_require_photo_for_bad
+                photo_required = policy.require_photo_for_bad
                 _logger.info(f"Photo validation required: {photo_required}")
                 
                 if photo_required:
@@ -230,7 +727,7 @@ class FleetInspection(models.Model):
                     _logger.info(f"Found {len(bad_items)} items marked as 'mal'")
                     
                     bad_items_without_photos = bad_items.filtered(
-                        lambda l: hasattr(l, 'photo_required') and l.photo_required and not l.photo_ids
+                        lambda l: l.photo_required and not l.photo_ids
                     )
                     if bad_items_without_photos:
                         bad_names = bad_items_without_photos.mapped('name')
@@ -244,8 +741,11 @@ class FleetInspection(models.Model):
             _logger.info("All validations passed, completing inspection...")
             
             # Complete the inspection
-            self.state = 'completed'
-            self.end_time = fields.Datetime.now()
+            # Timings are folded into the item statistics by a cron, away from the completion
+            self.write({'state': 'completed', 'end_time': fields.Datetime.now(), 'timing_pending': True})
+            self.env.ref('fleet_inspection_mobile.ir_cron_inspection_item_stats').sudo()._trigger()
+            status_label = dict(self._fields['overall_status'].selection).get(self.overall_status)
+            self.message_post(body=f"Inspección completada: {self.items_bad} elementos en mal estado, estado general {status_label}.")
             
             _logger.info(f"Inspection {self.id} marked as completed successfully")
             
@@ -263,7 +763,7 @@ class FleetInspection(models.Model):
         try:
             _logger.info("Maintenance request creation is temporarily disabled to avoid database constraint issues")
             # TODO: Re-enable after fixing fleet.service.type dependencies
-            # if hasattr(self.env.company, 'inspection_auto_create_maintenance') and self.env.company.inspection_auto_create_maintenance:
+            # if policy.auto_create_maintenance:
             #     _logger.info("Maintenance request creation is enabled, attempting to create requests...")
             #     self._create_maintenance_requests()
             #     _logger.info("Maintenance requests created successfully")
@@ -366,49 +866,172 @@ class FleetInspection(models.Model):
         self.ensure_one()
         if self.state != 'draft':
             raise UserError("Solo se pueden reanudar inspecciones en borrador.")
-        
+        return self._mobile_resume_action(self.id)
+
+    @api.model
+    def _mobile_resume_action(self, inspection_id):
+        """Client action reopening a draft by id; the draft may not be visible
+        to the current transaction (see start_or_resume)"""
         return {
             'type': 'ir.actions.client',
             'tag': 'fleet_inspection_mobile',
             'name': 'Inspección Vehicular',
             'target': 'fullscreen',
             'context': {
-                'default_inspection_id': self.id,
+                'default_inspection_id': inspection_id,
                 'mobile_interface': True,
                 'resume_inspection': True
             }
         }
 
+    def _navigation_line_ids(self, current_line_id=None, limit=1, backward=False, pending_only=True):
+        """Line ids after (or before) ``current_line_id`` in the stored order.
+
+        Uses the stored (section_sequence, sequence, id) ordering directly in
+        SQL instead of sorting every line of the inspection in Python.
+        """
+        self.ensure_one()
+        self.env['fleet.inspection.line'].flush_model(['inspection_id', 'status', 'needs_confirmation', 'section_sequence', 'sequence'])
+        position_key = "(COALESCE(section_sequence, 0), COALESCE(sequence, 0), id)"
+        conditions = ["inspection_id = %s"]
+        params = [self.id]
+        if pending_only:
+            conditions.append("(status IS NULL OR needs_confirmation)")
+        if current_line_id:
+            conditions.append(f"""{position_key} {'<' if backward else '>'} (
+                SELECT COALESCE(section_sequence, 0), COALESCE(sequence, 0), id
+                  FROM fleet_inspection_line
+                 WHERE id = %s AND inspection_id = %s
+            )""")
+            params += [current_line_id, self.id]
+        direction = 'DESC' if backward else 'ASC'
+        self.env.cr.execute(f"""
+            SELECT id FROM fleet_inspection_line
+             WHERE {' AND '.join(conditions)}
+          ORDER BY COALESCE(section_sequence, 0) {direction}, COALESCE(sequence, 0) {direction}, id {direction}
+             LIMIT %s
+        """, params + [limit])
+        return [row[0] for row in self.env.cr.fetchall()]
+
+    def get_navigation_window(self, current_line_id=None, window=5, pending_only=True):
+        """Navigation cursor for the mobile interface.
+
+        Returns the display data of the current line, the line right before
+        it and the next ``window`` pending lines after it (from the start when
+        no current line is given), so the client can prefetch ahead. Pending
+        lines are the unrated ones and the carried forward ones awaiting
+        confirmation. With ``pending_only=False`` the next lines are returned
+        whatever their status, for clients walking the checklist linearly.
+        """
+        self.ensure_one()
+        Line = self.env['fleet.inspection.line']
+        next_ids = self._navigation_line_ids(current_line_id, limit=window, pending_only=pending_only)
+        previous_ids = self._navigation_line_ids(current_line_id, backward=True, pending_only=False) if current_line_id else []
+        current_ids = Line.search([('id', '=', current_line_id), ('inspection_id', '=', self.id)]).ids if current_line_id else []
+
+        data = {line['id']: line for line in Line.browse(current_ids + previous_ids + next_ids)._get_mobile_data()}
+        return {
+            'current': data.get(current_ids[0]) if current_ids else False,
+            'previous': data.get(previous_ids[0]) if previous_ids else False,
+            'next': [data[line_id] for line_id in next_ids],
+            'remaining': Line.search_count([
+                ('inspection_id', '=', self.id),
+                '|', ('status', '=', False), ('needs_confirmation', '=', True),
+            ]),
+        }
+
+    def _mobile_line_skeleton(self):
+        """Every line of the inspection in checklist order, without the heavy
+        template texts: (id, name, status, needs_confirmation, section id, section name)"""
+        self.ensure_one()
+        self.env['fleet.inspection.line'].flush_model(['inspection_id', 'template_item_id', 'status', 'needs_confirmation', 'section_sequence', 'sequence'])
+        self.env['fleet.inspection.template.item'].flush_model(['name', 'section_id'])
+        self.env.cr.execute("""
+            SELECT l.id, t.name, l.status, l.needs_confirmation, s.id, s.name
+              FROM fleet_inspection_line l
+              JOIN fleet_inspection_template_item t ON t.id = l.template_item_id
+         LEFT JOIN fleet_inspection_template_section s ON s.id = t.section_id
+             WHERE l.inspection_id = %s
+          ORDER BY COALESCE(l.section_sequence, 0), COALESCE(l.sequence, 0), l.id
+        """, [self.id])
+        return self.env.cr.fetchall()
+
+    def get_inspection_section(self, section_index=None, include_header=False, line_ids=None):
+        """One section of the checklist for the mobile interface.
+
+        Large templates are delivered section by section: the client asks
+        for the first one with ``include_header`` (inspection header, the
+        section list and a light skeleton of every line) and fetches the
+        full display data of the other sections when it gets near them.
+
+        :param section_index: position of the section in the checklist,
+            defaults to the section of the first pending line
+        :param line_ids: lines of ``section_index``, known to the client from
+            the skeleton; when given without ``include_header`` only these
+            lines are read, the skeleton of the inspection is not rebuilt
+        :return: dict with ``section_index``, the section ``items`` display
+            data and, with ``include_header``, ``header``, ``sections`` and ``lines``
+        """
+        self.ensure_one()
+        Line = self.env['fleet.inspection.line']
+        if section_index is not None and line_ids is not None and not include_header:
+            lines = Line.search([('id', 'in', line_ids), ('inspection_id', '=', self.id)])
+            return {'section_index': section_index, 'items': lines._get_mobile_data()}
+
+        skeleton = self._mobile_line_skeleton()
+        section_ids = list(dict.fromkeys(row[4] for row in skeleton))
+        positions = {section_id: index for index, section_id in enumerate(section_ids)}
+        if section_index is None:
+            first_pending = next((row for row in skeleton if not row[2] or row[3]), None)
+            section_index = positions[first_pending[4]] if first_pending else 0
+        section_id = section_ids[section_index] if 0 <= section_index < len(section_ids) else None
+        line_ids = [row[0] for row in skeleton if row[4] == section_id] if section_ids else []
+        result = {
+            'section_index': section_index,
+            'items': Line.browse(line_ids)._get_mobile_data(),
+        }
+        if include_header:
+            sections = {}
+            for line_id, name, status, needs_confirmation, line_section_id, section_name in skeleton:
+                section = sections.setdefault(line_section_id, {'name': section_name or 'General', 'count': 0, 'pending': 0})
+                section['count'] += 1
+                section['pending'] += bool(not status or needs_confirmation)
+            result.update({
+                'header': {
+                    'id': self.id,
+                    'name': self.name,
+                    'state': self.state,
+                    'vehicle_id': [self.vehicle_id.id, self.vehicle_id.display_name],
+                    'license_plate': self.vehicle_id.license_plate,
+                    'vehicle_name': self.vehicle_id.name,
+                    'driver_id': [self.driver_id.id, self.driver_id.display_name],
+                    'template_id': self.template_id.id,
+                },
+                'sections': [sections[section_id] for section_id in section_ids],
+                'lines': [{
+                    'id': line_id,
+                    'name': name,
+                    'status': status,
+                    'needs_confirmation': needs_confirmation,
+                    'section': section_name or 'General',
+                    'section_index': positions[line_section_id],
+                } for line_id, name, status, needs_confirmation, line_section_id, section_name in skeleton],
+            })
+        return result
+
     def get_next_item(self, current_item_id=None):
         """Get next incomplete item for mobile interface"""
         self.ensure_one()
-        
-        incomplete_items = self.inspection_line_ids.filtered(lambda l: not l.status).sorted('sequence')
-        if not incomplete_items:
-            return False
-        
-        if not current_item_id:
-            return incomplete_items[0]
-        
-        current_index = incomplete_items.ids.index(current_item_id) if current_item_id in incomplete_items.ids else -1
-        if current_index >= 0 and current_index < len(incomplete_items) - 1:
-            return incomplete_items[current_index + 1]
-        
-        return False
+        line_ids = self._navigation_line_ids(current_item_id)
+        return self.env['fleet.inspection.line'].browse(line_ids[:1]) or False
 
     def get_previous_item(self, current_item_id):
         """Get previous item for mobile interface"""
         self.ensure_one()
-        
-        all_items = self.inspection_line_ids.sorted('sequence')
-        if not current_item_id or current_item_id not in all_items.ids:
+        if not current_item_id:
             return False
-        
-        current_index = all_items.ids.index(current_item_id)
-        if current_index > 0:
-            return all_items[current_index - 1]
-        
-        return False
+        line_ids = self._navigation_line_ids(current_item_id, backward=True, pending_only=False)
+        return self.env['fleet.inspection.line'].browse(line_ids[:1]) or False
 
     def action_view_details(self):
         """Open inspection details view"""
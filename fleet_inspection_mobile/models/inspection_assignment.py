@@ -0,0 +1,176 @@
+# -*- coding: utf-8 -*-
+from collections import defaultdict
+import heapq
+import logging
+
+from odoo import models, fields, api, tools
+
+from .fleet_vehicle_extension import INSPECTION_DUE_DAYS
+
+_logger = logging.getLogger(__name__)
+
+
+class FleetInspectionAssignment(models.Model):
+    _name = 'fleet.inspection.assignment'
+    _description = 'Asignación de Inspección'
+    _order = 'date desc, user_id, id'
+
+    date = fields.Date(string='Fecha', required=True, index=True)
+    vehicle_id = fields.Many2one('fleet.vehicle', string='Vehículo', required=True, ondelete='cascade')
+    user_id = fields.Many2one('res.users', string='Inspector', required=True, ondelete='cascade')
+    company_id = fields.Many2one('res.company', string='Compañía')
+    state = fields.Selection([
+        ('pending', 'Pendiente'),
+        ('done', 'Realizada'),
+        ('missed', 'No Realizada'),
+    ], string='Estado', default='pending', required=True)
+    inspection_id = fields.Many2one('fleet.inspection', string='Inspección', ondelete='set null')
+    # Snapshot taken by the scheduler, so the start screen needs no fleet-wide query
+    last_inspection_date = fields.Datetime(string='Última Inspección')
+
+    _sql_constraints = [
+        ('date_vehicle_unique', 'unique(date, vehicle_id)', 'Un vehículo solo puede asignarse una vez por día.'),
+    ]
+
+    def init(self):
+        # Start screen: pending assignments of one inspector for one day
+        tools.create_index(
+            self._cr, 'fleet_inspection_assignment_user_pending_idx', self._table,
+            ['user_id', 'date'], where="state = 'pending'",
+        )
+
+    @api.model
+    def _get_start_screen_vehicles(self):
+        """Today's pending assignments of the current user, as start screen vehicles"""
+        assignments = self.search([
+            ('user_id', '=', self.env.uid),
+            ('date', '=', fields.Date.context_today(self)),
+            ('state', '=', 'pending'),
+        ], order='last_inspection_date asc nulls first, id')
+        vehicles_data = {
+            vehicle['id']: vehicle
+            for vehicle in assignments.vehicle_id.read(['name', 'license_plate', 'driver_id', 'model_id'])
+        }
+        now = fields.Datetime.now()
+        return [
+            dict(vehicles_data[assignment.vehicle_id.id],
+                 assignment_id=assignment.id,
+                 last_inspection_date=assignment.last_inspection_date,
+                 days_since_inspection=(now - assignment.last_inspection_date).days
+                 if assignment.last_inspection_date else None)
+            for assignment in assignments
+        ]
+
+    @api.model
+    def _mark_done(self, inspections):
+        """Close the pending assignments of the vehicles of completed ``inspections``"""
+        inspection_by_vehicle = {inspection.vehicle_id.id: inspection for inspection in inspections}
+        assignments = self.sudo().search([
+            ('vehicle_id', 'in', list(inspection_by_vehicle)),
+            ('state', '=', 'pending'),
+            ('date', '<=', fields.Date.context_today(self)),
+        ])
+        assignments_by_inspection = defaultdict(lambda: self.sudo().browse())
+        for assignment in assignments:
+            assignments_by_inspection[inspection_by_vehicle[assignment.vehicle_id.id]] |= assignment
+        for inspection, inspection_assignments in assignments_by_inspection.items():
+            inspection_assignments.write({'state': 'done', 'inspection_id': inspection.id})
+
+    @api.model
+    def _cron_schedule_assignments(self):
+        """Nightly: mark unfinished assignments as missed and assign today's due vehicles"""
+        today = fields.Date.context_today(self)
+        missed = self.search([('state', '=', 'pending'), ('date', '<', today)])
+        missed.write({'state': 'missed'})
+
+        inspectors = self._get_available_inspectors()
+        due_vehicles = self._get_unassigned_due_vehicles(today)
+        # Already assigned today (e.g. the job ran twice) count towards the load
+        load = defaultdict(int)
+        for group in self.read_group(
+                [('date', '=', today), ('state', '=', 'pending')], ['user_id'], ['user_id']):
+            load[group['user_id'][0]] = group['user_id_count']
+        heaps = {
+            company_id: [(load[user_id], user_id) for user_id in user_ids]
+            for company_id, user_ids in inspectors.items()
+        }
+        for heap in heaps.values():
+            heapq.heapify(heap)
+
+        def least_loaded(heap):
+            # Loads only grow, so stale entries are refreshed when they reach the top
+            while True:
+                count, user_id = heap[0]
+                if count == load[user_id]:
+                    return user_id
+                heapq.heapreplace(heap, (load[user_id], user_id))
+
+        all_inspectors = set().union(*inspectors.values())
+        vals_list = []
+        skipped = 0
+        for vehicle_id, company_id, driver_user_ids, last_date in due_vehicles:
+            heap = heaps.get(company_id)
+            # The vehicle's own driver inspects it when available, otherwise the least loaded inspector;
+            # without inspectors in its company (or without company) only its driver can
+            candidates = inspectors[company_id] if heap else all_inspectors
+            user_id = next((user_id for user_id in driver_user_ids if user_id in candidates), None)
+            if user_id is None:
+                if not heap:
+                    skipped += 1
+                    continue
+                user_id = least_loaded(heap)
+            load[user_id] += 1
+            vals_list.append({
+                'date': today,
+                'vehicle_id': vehicle_id,
+                'user_id': user_id,
+                'company_id': company_id,
+                'last_inspection_date': last_date,
+            })
+        self.create(vals_list)
+        _logger.info(f"Marked {len(missed)} inspection assignments as missed, created {len(vals_list)}")
+        if skipped:
+            _logger.warning(f"{skipped} due vehicles were not assigned: no available inspector in their company "
+                            f"(or no company) and no available driver")
+
+    @api.model
+    def _get_available_inspectors(self):
+        """Available inspection users per company: dict company id -> set of user ids"""
+        users = self.env.ref('fleet_inspection_mobile.group_fleet_inspection_user').users.filtered(
+            lambda user: user.active and not user.share and user.inspection_available
+        )
+        inspectors = defaultdict(set)
+        for user in users:
+            for company in user.company_ids:
+                inspectors[company.id].add(user.id)
+        return inspectors
+
+    @api.model
+    def _get_unassigned_due_vehicles(self, date):
+        """(vehicle id, company id, driver user ids, last inspection date) of the
+        active vehicles whose inspection is due and are not assigned on ``date``"""
+        self.env['fleet.inspection'].flush_model(['vehicle_id', 'state', 'inspection_date'])
+        self.env['fleet.vehicle'].flush_model(['company_id', 'driver_id', 'active'])
+        self.flush_model(['date', 'vehicle_id'])
+        self.env.cr.execute("""
+            SELECT v.id, v.company_id, array_remove(array_agg(u.id), NULL), latest.inspection_date
+              FROM fleet_vehicle v
+         LEFT JOIN LATERAL (
+                    SELECT i.inspection_date
+                      FROM fleet_inspection i
+                     WHERE i.vehicle_id = v.id AND i.state = 'completed'
+                  ORDER BY i.inspection_date DESC, i.id DESC
+                     LIMIT 1
+                   ) latest ON true
+         LEFT JOIN res_users u ON u.partner_id = v.driver_id AND u.active
+             WHERE v.active
+               AND (latest.inspection_date IS NULL
+                    OR latest.inspection_date <= NOW() AT TIME ZONE 'UTC' - make_interval(days => %s))
+               AND NOT EXISTS (
+                    SELECT 1 FROM fleet_inspection_assignment a
+                     WHERE a.vehicle_id = v.id AND a.date = %s
+               )
+          GROUP BY v.id, v.company_id, latest.inspection_date
+          ORDER BY latest.inspection_date NULLS FIRST, v.id
+        """, [INSPECTION_DUE_DAYS, date])
+        return self.env.cr.fetchall()
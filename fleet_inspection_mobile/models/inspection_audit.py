@@ -0,0 +1,105 @@
+# -*- coding: utf-8 -*-
+from odoo import models, fields, api, tools
+from odoo.exceptions import UserError
+from psycopg2.extras import execute_values
+
+# Pending audit rows of the transaction, written in one INSERT at flush time
+AUDIT_PRECOMMIT_KEY = 'fleet_inspection_audit'
+
+AUDITED_FIELDS = {
+    'fleet.inspection': ('state', 'vehicle_id', 'driver_id', 'template_id', 'odometer'),
+    'fleet.inspection.line': ('status', 'observations'),
+}
+
+
+class FleetInspectionAudit(models.Model):
+    _name = 'fleet.inspection.audit'
+    _description = 'Registro de Auditoría de Inspección'
+    _order = 'id desc'
+    _log_access = False
+
+    inspection_id = fields.Many2one('fleet.inspection', string='Inspección', required=True, ondelete='cascade', readonly=True)
+    line_id = fields.Many2one('fleet.inspection.line', string='Elemento', ondelete='set null', readonly=True)
+    user_id = fields.Many2one('res.users', string='Usuario', readonly=True)
+    date = fields.Datetime(string='Fecha', readonly=True)
+    field_name = fields.Char(string='Campo', readonly=True)
+    old_value = fields.Char(string='Valor Anterior', readonly=True)
+    new_value = fields.Char(string='Valor Nuevo', readonly=True)
+
+    def init(self):
+        # Audit of one inspection, newest first
+        tools.create_index(self._cr, 'fleet_inspection_audit_inspection_idx', self._table, ['inspection_id', 'id DESC'])
+
+    def write(self, vals):
+        raise UserError("El registro de auditoría no se puede modificar.")
+
+    @api.model
+    def _audit_value(self, record, field_name):
+        value = record[field_name]
+        if isinstance(value, models.BaseModel):
+            return value.display_name or None
+        if value is False or value is None:
+            return None
+        return str(value)
+
+    @api.model
+    def _snapshot(self, records, vals):
+        """Current values of the audited fields ``vals`` is about to change"""
+        field_names = [name for name in AUDITED_FIELDS[records._name] if name in vals]
+        if not field_names:
+            return {}
+        return {
+            record.id: {name: self._audit_value(record, name) for name in field_names}
+            for record in records
+        }
+
+    @api.model
+    def _log_changes(self, records, snapshot):
+        """Queue one audit row per field that changed since ``snapshot``"""
+        if not snapshot:
+            return
+        now = self.env.cr.now()
+        rows = []
+        for record in records:
+            if record._name == 'fleet.inspection.line':
+                inspection_id, line_id = record.inspection_id.id, record.id
+            else:
+                inspection_id, line_id = record.id, None
+            for name, old_value in snapshot.get(record.id, {}).items():
+                new_value = self._audit_value(record, name)
+                if new_value != old_value:
+                    rows.append((inspection_id, line_id, self.env.uid, now, name, old_value, new_value))
+        self._queue_rows(rows)
+
+    @api.model
+    def _log_creation(self, inspections):
+        """Queue one 'create' row per new inspection, with its name as new value"""
+        now = self.env.cr.now()
+        self._queue_rows([
+            (inspection.id, None, self.env.uid, now, 'create', None, inspection.display_name)
+            for inspection in inspections
+        ])
+
+    @api.model
+    def _queue_rows(self, rows):
+        if not rows:
+            return
+        precommit = self.env.cr.precommit
+        if AUDIT_PRECOMMIT_KEY not in precommit.data:
+            precommit.data[AUDIT_PRECOMMIT_KEY] = []
+            precommit.add(self._flush_audit_rows)
+        precommit.data[AUDIT_PRECOMMIT_KEY].extend(rows)
+
+    def _flush_audit_rows(self):
+        rows = self.env.cr.precommit.data.pop(AUDIT_PRECOMMIT_KEY, [])
+        if not rows:
+            return
+        # Rows of inspections (or lines) deleted later in the transaction are dropped
+        execute_values(self.env.cr._obj, """
+            INSERT INTO fleet_inspection_audit
+                   (inspection_id, line_id, user_id, date, field_name, old_value, new_value)
+            SELECT v.inspection_id, l.id, v.user_id, v.date, v.field_name, v.old_value, v.new_value
+              FROM (VALUES %s) AS v (inspection_id, line_id, user_id, date, field_name, old_value, new_value)
+              JOIN fleet_inspection i ON i.id = v.inspection_id
+         LEFT JOIN fleet_inspection_line l ON l.id = v.line_id
+        """, rows, template='(%s::int, %s::int, %s::int, %s::timestamp, %s, %s, %s)', page_size=1000)
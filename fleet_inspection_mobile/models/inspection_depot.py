@@ -0,0 +1,28 @@
+# -*- coding: utf-8 -*-
+from odoo import models, fields, api
+
+from ..tools import geohash
+
+
+class FleetInspectionDepot(models.Model):
+    _name = 'fleet.inspection.depot'
+    _description = 'Depósito de Flota'
+    _order = 'company_id, name'
+
+    name = fields.Char(string='Nombre', required=True)
+    active = fields.Boolean(string='Activo', default=True)
+    company_id = fields.Many2one('res.company', string='Compañía', required=True, default=lambda self: self.env.company)
+    latitude = fields.Float(string='Latitud', digits=(10, 7), required=True)
+    longitude = fields.Float(string='Longitud', digits=(10, 7), required=True)
+    radius = fields.Integer(string='Radio (m)', default=300, required=True,
+                            help="Las inspecciones a esta distancia o menos se consideran hechas en el depósito")
+    geohash = fields.Char(string='Geohash', compute='_compute_geohash', store=True)
+
+    _sql_constraints = [
+        ('radius_positive', 'CHECK(radius > 0)', 'El radio del depósito debe ser positivo.'),
+    ]
+
+    @api.depends('latitude', 'longitude')
+    def _compute_geohash(self):
+        for depot in self:
+            depot.geohash = geohash.encode(depot.latitude, depot.longitude)
@@ -0,0 +1,155 @@
+# -*- coding: utf-8 -*-
+from collections import defaultdict
+from datetime import timedelta
+import logging
+
+from odoo import models, fields, api
+
+from .fleet_vehicle_extension import INSPECTION_DUE_DAYS
+
+_logger = logging.getLogger(__name__)
+
+# Vehicles listed by name per company and section, the rest are only counted
+DIGEST_MAX_VEHICLES = 25
+
+
+class FleetInspectionDigest(models.AbstractModel):
+    _name = 'fleet.inspection.digest'
+    _description = 'Resumen Diario de Inspecciones'
+
+    @api.model
+    def _cron_send_daily_digest(self):
+        """Queue one digest email per inspection manager covering their companies"""
+        date_to = fields.Datetime.now()
+        date_from = date_to - timedelta(days=1)
+        managers = self.env.ref('fleet_inspection_mobile.group_fleet_inspection_manager').users.filtered(
+            lambda user: user.active and user.email
+        )
+        if not managers:
+            return
+        digests = self._get_digest_data(set(managers.company_ids.ids), date_from, date_to)
+        base_url = self.env['ir.config_parameter'].sudo().get_param('web.base.url')
+
+        mail_values = []
+        for manager in managers:
+            companies = [digests[company.id] for company in manager.company_ids if company.id in digests]
+            if not companies:
+                continue
+            body = self.env['ir.qweb']._render('fleet_inspection_mobile.inspection_daily_digest', {
+                'manager': manager,
+                'companies': companies,
+                'date_from': date_from,
+                'date_to': date_to,
+                'base_url': base_url,
+                'due_days': INSPECTION_DUE_DAYS,
+            })
+            mail_values.append({
+                'subject': f"Resumen de inspecciones del {fields.Date.to_string(date_to)}",
+                'body_html': body,
+                'email_from': manager.company_id.email_formatted or self.env.company.email_formatted,
+                'recipient_ids': [(4, manager.partner_id.id)],
+                'auto_delete': True,
+            })
+        # The mail queue cron sends them in batches
+        self.env['mail.mail'].sudo().create(mail_values)
+        _logger.info(f"Queued {len(mail_values)} inspection digests")
+
+    @api.model
+    def _get_digest_data(self, company_ids, date_from, date_to):
+        """Digest content of every company in ``company_ids``, three queries in total
+
+        :return: dict company id -> completed inspection counts by status,
+            vehicles whose last inspection requires maintenance, vehicles
+            whose inspection is due and yesterday's missed assignments;
+            companies with nothing to report are left out
+        """
+        Inspection = self.env['fleet.inspection']
+        Inspection.flush_model(['vehicle_id', 'state', 'inspection_date', 'overall_status'])
+        self.env['fleet.vehicle'].flush_model(['company_id', 'active', 'name', 'license_plate'])
+        company_ids = tuple(company_ids)
+        if not company_ids:
+            return {}
+        digests = {}
+
+        def digest(company_id):
+            if company_id not in digests:
+                digests[company_id] = {
+                    'company': self.env['res.company'].browse(company_id),
+                    'completed': defaultdict(int),
+                    'maintenance_vehicles': [],
+                    'maintenance_count': 0,
+                    'due_vehicles': [],
+                    'due_count': 0,
+                    'missed_assignments': [],
+                    'missed_count': 0,
+                }
+            return digests[company_id]
+
+        self.env.cr.execute("""
+            SELECT v.company_id, i.overall_status, count(*)
+              FROM fleet_inspection i
+              JOIN fleet_vehicle v ON v.id = i.vehicle_id
+             WHERE i.state = 'completed'
+               AND i.inspection_date >= %s AND i.inspection_date < %s
+               AND v.company_id IN %s
+          GROUP BY v.company_id, i.overall_status
+        """, [date_from, date_to, company_ids])
+        for company_id, status, count in self.env.cr.fetchall():
+            completed = digest(company_id)['completed']
+            completed[status or 'good'] += count
+            completed['total'] += count
+
+        # Last completed inspection per vehicle: maintenance status and due date in one pass
+        self.env.cr.execute("""
+            SELECT v.company_id, v.id, v.name, v.license_plate, latest.id, latest.inspection_date, latest.overall_status
+              FROM fleet_vehicle v
+         LEFT JOIN LATERAL (
+                    SELECT i.id, i.inspection_date, i.overall_status
+                      FROM fleet_inspection i
+                     WHERE i.vehicle_id = v.id AND i.state = 'completed'
+                  ORDER BY i.inspection_date DESC, i.id DESC
+                     LIMIT 1
+                   ) latest ON true
+             WHERE v.active AND v.company_id IN %s
+               AND (latest.id IS NULL
+                    OR latest.overall_status = 'maintenance'
+                    OR latest.inspection_date <= %s - make_interval(days => %s))
+          ORDER BY latest.inspection_date NULLS FIRST, v.id
+        """, [company_ids, date_to, INSPECTION_DUE_DAYS])
+        due_limit = date_to - timedelta(days=INSPECTION_DUE_DAYS)
+        for company_id, vehicle_id, name, plate, inspection_id, date, status in self.env.cr.fetchall():
+            values = digest(company_id)
+            vehicle = {
+                'id': vehicle_id,
+                'name': name,
+                'license_plate': plate,
+                'inspection_id': inspection_id,
+                'inspection_date': date,
+                'days_since_inspection': (date_to - date).days if date else None,
+            }
+            if status == 'maintenance':
+                values['maintenance_count'] += 1
+                if len(values['maintenance_vehicles']) < DIGEST_MAX_VEHICLES:
+                    values['maintenance_vehicles'].append(vehicle)
+            if not date or date <= due_limit:
+                values['due_count'] += 1
+                if len(values['due_vehicles']) < DIGEST_MAX_VEHICLES:
+                    values['due_vehicles'].append(vehicle)
+
+        # Assignments of the previous day the scheduler marked as missed
+        self.env['fleet.inspection.assignment'].flush_model(['date', 'state', 'company_id', 'vehicle_id', 'user_id'])
+        self.env.cr.execute("""
+            SELECT a.company_id, v.name, v.license_plate, p.name
+              FROM fleet_inspection_assignment a
+              JOIN fleet_vehicle v ON v.id = a.vehicle_id
+              JOIN res_users u ON u.id = a.user_id
+              JOIN res_partner p ON p.id = u.partner_id
+             WHERE a.state = 'missed' AND a.date = %s AND a.company_id IN %s
+          ORDER BY p.name, v.name
+        """, [fields.Date.subtract(date_to.date(), days=1), company_ids])
+        for company_id, name, plate, inspector in self.env.cr.fetchall():
+            values = digest(company_id)
+            values['missed_count'] += 1
+            if len(values['missed_assignments']) < DIGEST_MAX_VEHICLES:
+                values['missed_assignments'].append({'name': name, 'license_plate': plate, 'inspector': inspector})
+        return digests
@@ -1,11 +1,17 @@
 # -*- coding: utf-8 -*-
-from odoo import models, fields, api
+from odoo import models, fields, api, tools
+
+from ..tools.observation_search import ensure_tsvector_column
 
 
 class FleetInspectionLine(models.Model):
     _name = 'fleet.inspection.line'
     _description = 'Inspection Checklist Item'
-    _order = 'sequence, id'
+    _order = 'section_sequence, sequence, id'
+    _sql_constraints = [
+        ('inspection_template_item_unique', 'unique(inspection_id, template_item_id)',
+         'Cada elemento de la plantilla solo puede aparecer una vez por inspección.'),
+    ]
 
     inspection_id = fields.Many2one('fleet.inspection', string='Inspection', required=True, ondelete='cascade')
     template_item_id = fields.Many2one('fleet.inspection.template.item', string='Template Item', required=True, ondelete='restrict')
@@ -25,6 +31,8 @@ class FleetInspectionLine(models.Model):
     ], string='Status')
     
     observations = fields.Text(string='Observations')
+    # Carried forward from the last inspection and not 'bien': must be rated again
+    needs_confirmation = fields.Boolean(string='Needs Confirmation', default=False)
     
     # Photos
     photo_ids = fields.One2many('fleet.inspection.photo', 'line_id', string='Photos')
@@ -38,6 +46,11 @@ class FleetInspectionLine(models.Model):
     # Mobile interface helpers
     is_completed = fields.Boolean(string='Completed', compute='_compute_is_completed')
 
+    def init(self):
+        # Lines of an inspection, pending ones (status IS NULL) and by status
+        tools.create_index(self._cr, 'fleet_inspection_line_inspection_status_idx', self._table, ['inspection_id', 'status'])
+        ensure_tsvector_column(self._cr, self._table)
+
     @api.depends('photo_ids')
     def _compute_photo_count(self):
         for record in self:
@@ -46,12 +59,8 @@ class FleetInspectionLine(models.Model):
     @api.depends('status')
     def _compute_photo_required(self):
         for record in self:
-            company = record.inspection_id.vehicle_id.company_id or self.env.company
-            record.photo_required = (
-                record.status == 'mal' and company.inspection_require_photo_for_bad
-            ) or (
-                record.status == 'regular' and company.inspection_allow_photo_for_regular
-            )
+            policy = record.inspection_id._get_inspection_policy()
+            record.photo_required = policy.photo_required(record.status)
 
     @api.depends('status')
     def _compute_is_completed(self):
@@ -62,8 +71,16 @@ class FleetInspectionLine(models.Model):
         """Override to add timestamps"""
         if 'status' in vals and vals['status']:
             vals['inspected_at'] = fields.Datetime.now()
+        if 'status' in vals:
+            vals.setdefault('needs_confirmation', False)
         
-        return super().write(vals)
+        Audit = self.env['fleet.inspection.audit']
+        snapshot = Audit._snapshot(self, vals)
+        res = super().write(vals)
+        Audit._log_changes(self, snapshot)
+        if 'status' in vals:
+            self.inspection_id._notify_progress()
+        return res
 
     def action_take_photo(self):
         """Open camera interface for taking photos"""
@@ -82,6 +99,24 @@ class FleetInspectionLine(models.Model):
             }
         }
 
+    def _get_mobile_data(self):
+        """Display data for the mobile interface, one dict per line"""
+        return [{
+            'id': line.id,
+            'status': line.status,
+            'needs_confirmation': line.needs_confirmation,
+            'observations': line.observations or '',
+            'section_sequence': line.section_sequence,
+            'sequence': line.sequence,
+            'name': line.template_item_id.name,
+            'description': line.template_item_id.description or '',
+            'section': line.template_item_id.section_id.name or 'General',
+            'instructions': line.template_item_id.instructions or '',
+            'tips': line.template_item_id.tips or '',
+            'photo_required': line.template_item_id.photo_required_on_bad,
+            'photo_count': line.photo_count,
+        } for line in self]
+
     def get_status_display(self):
         """Get localized status display"""
         status_map = {
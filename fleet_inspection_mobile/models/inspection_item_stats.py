@@ -0,0 +1,117 @@
+# -*- coding: utf-8 -*-
+from bisect import bisect_left
+from collections import defaultdict
+
+import logging
+
+from odoo import models, fields, api
+
+_logger = logging.getLogger(__name__)
+
+# Target duration of a whole inspection (PRD), in seconds
+INSPECTION_TARGET_SECONDS = 180
+# Upper bounds of the histogram buckets: 1 s resolution up to two minutes,
+# then 10 s up to 15 minutes; longer samples land in an overflow bucket
+TIMING_BUCKETS = list(range(1, 121)) + list(range(130, 901, 10))
+# Completed inspections folded per cron run, the rest in a new run
+TIMING_FOLD_BATCH = 500
+
+
+def _histogram_percentile(histogram, count, ratio):
+    """Upper bound of the bucket holding the ``ratio`` percentile"""
+    rank = ratio * count
+    seen = 0
+    for index, bucket_count in enumerate(histogram):
+        seen += bucket_count
+        if bucket_count and seen >= rank:
+            return TIMING_BUCKETS[index] if index < len(TIMING_BUCKETS) else TIMING_BUCKETS[-1]
+    return 0.0
+
+
+class FleetInspectionItemStats(models.Model):
+    _name = 'fleet.inspection.item.stats'
+    _description = 'Inspection Item Timing Statistics'
+    _order = 'p90_seconds desc'
+    _rec_name = 'template_item_id'
+
+    template_item_id = fields.Many2one('fleet.inspection.template.item', string='Elemento', required=True, ondelete='cascade')
+    template_id = fields.Many2one(related='template_item_id.template_id', string='Plantilla', store=True)
+    section_id = fields.Many2one(related='template_item_id.section_id', string='Sección', store=True)
+
+    sample_count = fields.Integer(string='Inspecciones', readonly=True)
+    total_seconds = fields.Float(string='Total (s)', readonly=True)
+    average_seconds = fields.Float(string='Promedio (s)', compute='_compute_average', store=True)
+    median_seconds = fields.Float(string='Mediana (s)', readonly=True)
+    p90_seconds = fields.Float(string='P90 (s)', readonly=True)
+    target_share = fields.Float(
+        string='% del Objetivo', compute='_compute_target_share', store=True,
+        help="Share of the 3-minute inspection target taken by this item at the median"
+    )
+    # Sample counts per TIMING_BUCKETS bucket, plus the overflow bucket
+    histogram = fields.Json(string='Histogram', readonly=True)
+
+    _sql_constraints = [
+        ('template_item_unique', 'unique(template_item_id)', 'Solo puede haber una estadística por elemento.'),
+    ]
+
+    @api.depends('sample_count', 'total_seconds')
+    def _compute_average(self):
+        for record in self:
+            record.average_seconds = record.total_seconds / record.sample_count if record.sample_count else 0.0
+
+    @api.depends('median_seconds')
+    def _compute_target_share(self):
+        for record in self:
+            record.target_share = record.median_seconds / INSPECTION_TARGET_SECONDS * 100
+
+    @api.model
+    def _cron_fold_timings(self):
+        """Fold the timings of completed inspections into the statistics.
+
+        Completion only flags the inspection, so the shared statistics rows
+        are written by this job alone and never by concurrent completions.
+        """
+        inspections = self.env['fleet.inspection'].search(
+            [('timing_pending', '=', True)], order='id', limit=TIMING_FOLD_BATCH,
+        )
+        if not inspections:
+            return
+        self._add_samples(inspections.inspection_line_ids)
+        inspections.write({'timing_pending': False})
+        _logger.info(f"Folded item timings of {len(inspections)} inspections")
+        if len(inspections) == TIMING_FOLD_BATCH:
+            self.env.ref('fleet_inspection_mobile.ir_cron_inspection_item_stats').sudo()._trigger()
+
+    @api.model
+    def _add_samples(self, lines):
+        """Fold the time spent on ``lines`` into the per-item statistics.
+
+        Each line is one sample of its template item. Only the histogram is
+        updated, so past inspections are never read again. Only called by
+        _cron_fold_timings, the single writer of these rows.
+        """
+        samples = defaultdict(list)
+        for line in lines:
+            if line.time_spent > 0:
+                samples[line.template_item_id.id].append(line.time_spent)
+        if not samples:
+            return
+
+        stats = self.search([('template_item_id', 'in', list(samples))])
+        missing = set(samples) - set(stats.template_item_id.ids)
+        if missing:
+            stats |= self.create([{'template_item_id': item_id} for item_id in missing])
+
+        for record in stats:
+            item_samples = samples[record.template_item_id.id]
+            histogram = list(record.histogram or [0] * (len(TIMING_BUCKETS) + 1))
+            for seconds in item_samples:
+                histogram[bisect_left(TIMING_BUCKETS, seconds)] += 1
+            count = record.sample_count + len(item_samples)
+            record.write({
+                'sample_count': count,
+                'total_seconds': record.total_seconds + sum(item_samples),
+                'histogram': histogram,
+                'median_seconds': _histogram_percentile(histogram, count, 0.5),
+                'p90_seconds': _histogram_percentile(histogram, count, 0.9),
+            })
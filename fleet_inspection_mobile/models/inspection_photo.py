@@ -1,19 +1,30 @@
 # -*- coding: utf-8 -*-
-from odoo import models, fields, api
+from odoo import models, fields, api, tools
 from odoo.exceptions import UserError
 import base64
 import logging
 
+from ..tools import geohash
+
 _logger = logging.getLogger(__name__)
 
 
+def _base64_decoded_size(data):
+    """Size in bytes of base64 encoded ``data``, without decoding it"""
+    if isinstance(data, str):
+        data = data.encode()
+    # Encoders may wrap the payload in lines; whitespace carries no data
+    data = b''.join(data.split())
+    return len(data) * 3 // 4 - data[-2:].count(b'=')
+
+
 class FleetInspectionPhoto(models.Model):
     _name = 'fleet.inspection.photo'
     _description = 'Inspection Photo'
     _order = 'sequence, id'
 
-    line_id = fields.Many2one('fleet.inspection.line', string='Inspection Item', required=True, ondelete='cascade')
-    inspection_id = fields.Many2one('fleet.inspection', string='Inspection', related='line_id.inspection_id', store=True)
+    line_id = fields.Many2one('fleet.inspection.line', string='Inspection Item', required=True, ondelete='cascade', index=True)
+    inspection_id = fields.Many2one('fleet.inspection', string='Inspection', related='line_id.inspection_id', store=True, index=True)
     
     name = fields.Char(string='Photo Name', required=True)
     description = fields.Text(string='Description')
@@ -29,22 +40,124 @@ class FleetInspectionPhoto(models.Model):
     device_info = fields.Char(string='Device Info')
     gps_latitude = fields.Float(string='GPS Latitude', digits=(10, 7))
     gps_longitude = fields.Float(string='GPS Longitude', digits=(10, 7))
+    # Indexed for prefix searches, see search_within_radius()
+    geohash = fields.Char(string='Geohash', compute='_compute_geohash', store=True)
     
     # Annotations
     has_annotations = fields.Boolean(string='Has Annotations', default=False)
     annotations_data = fields.Text(string='Annotations JSON')
 
+    def init(self):
+        tools.create_index(
+            self._cr, 'fleet_inspection_photo_geohash_idx', self._table,
+            ['geohash varchar_pattern_ops'], where='geohash IS NOT NULL',
+        )
+
+    @api.depends('gps_latitude', 'gps_longitude')
+    def _compute_geohash(self):
+        for photo in self:
+            # 0, 0 is what the client sends when there was no GPS fix
+            if photo.gps_latitude or photo.gps_longitude:
+                photo.geohash = geohash.encode(photo.gps_latitude, photo.gps_longitude)
+            else:
+                photo.geohash = False
+
     @api.model
-    def create(self, vals):
-        """Override create to handle photo processing"""
-        if 'image' in vals and vals['image']:
-            vals['image_size'] = len(base64.b64decode(vals['image']))
-            
-        if not vals.get('name'):
-            sequence = len(self.search([('line_id', '=', vals.get('line_id'))]))
-            vals['name'] = f"Photo {sequence + 1}"
-            
-        return super().create(vals)
+    def search_within_radius(self, latitude, longitude, radius):
+        """Photos taken within ``radius`` metres of a point, nearest first
+
+        The geohash cells covering the circle select the candidates through
+        the prefix index, the exact distance is checked on those only.
+
+        :return: list of dicts with ``photo_id``, ``inspection_id`` and ``distance`` in metres
+        """
+        self.flush_model(['geohash', 'gps_latitude', 'gps_longitude', 'inspection_id'])
+        cells = geohash.cover(latitude, longitude, radius)
+        visible_sql, visible_params = self._search([]).subselect()
+        distance_sql = geohash.haversine_sql('gps_latitude', 'gps_longitude')
+        self.env.cr.execute(f"""
+            SELECT id, inspection_id, distance FROM (
+                SELECT id, inspection_id, {distance_sql} AS distance
+                  FROM fleet_inspection_photo
+                 WHERE ({' OR '.join(['geohash LIKE %s'] * len(cells))})
+                   AND id IN ({visible_sql})
+            ) candidates
+             WHERE distance <= %s
+          ORDER BY distance
+        """, [latitude, latitude, longitude, *(f'{cell}%' for cell in cells), *visible_params, radius])
+        return [
+            {'photo_id': photo_id, 'inspection_id': inspection_id, 'distance': distance}
+            for photo_id, inspection_id, distance in self.env.cr.fetchall()
+        ]
+
+    @api.model
+    def search_outside_depots(self, date_from=None, date_to=None, company_ids=None):
+        """Located photos farther than the radius of every active depot of their company
+
+        :param date_from: only photos taken from this datetime on
+        :param date_to: only photos taken up to this datetime
+        :param company_ids: companies to check, defaults to the allowed ones
+        :return: list of dicts with ``photo_id`` and ``inspection_id``
+        """
+        self.flush_model(['geohash', 'gps_latitude', 'gps_longitude', 'inspection_id', 'taken_at'])
+        self.env['fleet.inspection.depot'].flush_model()
+        domain = [('geohash', '!=', False), ('inspection_id.vehicle_id.company_id', 'in', company_ids or self.env.companies.ids)]
+        if date_from:
+            domain.append(('taken_at', '>=', date_from))
+        if date_to:
+            domain.append(('taken_at', '<=', date_to))
+        photos_sql, photos_params = self._search(domain).subselect()
+        distance_sql = geohash.haversine_sql('p.gps_latitude', 'p.gps_longitude', 'd.latitude', 'd.longitude')
+        # The bounding box test is cheap and rules out most depots before the distance
+        self.env.cr.execute(f"""
+            SELECT p.id, p.inspection_id
+              FROM fleet_inspection_photo p
+              JOIN fleet_inspection i ON i.id = p.inspection_id
+              JOIN fleet_vehicle v ON v.id = i.vehicle_id
+             WHERE p.id IN ({photos_sql})
+               AND NOT EXISTS (
+                    SELECT 1 FROM fleet_inspection_depot d
+                     WHERE d.active AND d.company_id = v.company_id
+                       AND abs(p.gps_latitude - d.latitude) * %s <= d.radius
+                       AND {distance_sql} <= d.radius
+               )
+          ORDER BY p.taken_at DESC, p.id DESC
+        """, [*photos_params, geohash.METERS_PER_DEGREE])
+        return [
+            {'photo_id': photo_id, 'inspection_id': inspection_id}
+            for photo_id, inspection_id in self.env.cr.fetchall()
+        ]
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        """Create photos in batch, across any number of inspection lines.
+
+        Existing photos of all target lines are counted with one grouped
+        query, used both to name unnamed photos and to enforce the company's
+        ``inspection_max_photos_per_item`` quota.
+        """
+        line_ids = list({vals['line_id'] for vals in vals_list if vals.get('line_id')})
+        counts = {
+            group['line_id'][0]: group['line_id_count']
+            for group in self.read_group([('line_id', 'in', line_ids)], ['line_id'], ['line_id'])
+        } if line_ids else {}
+
+        for vals in vals_list:
+            if vals.get('image'):
+                vals['image_size'] = _base64_decoded_size(vals['image'])
+            line_id = vals.get('line_id')
+            counts[line_id] = counts.get(line_id, 0) + 1
+            if not vals.get('name'):
+                vals['name'] = f"Photo {counts[line_id]}"
+
+        for line in self.env['fleet.inspection.line'].browse(line_ids):
+            max_photos = line.inspection_id._get_inspection_policy().max_photos_per_item
+            if max_photos and counts[line.id] > max_photos:
+                raise UserError(
+                    f"Se permiten como máximo {max_photos} fotos por elemento ({line.display_name})."
+                )
+
+        return super().create(vals_list)
 
     def action_annotate_photo(self):
         """Open photo annotation interface"""
@@ -126,7 +239,7 @@ class FleetInspectionPhoto(models.Model):
         
         # Generate filename
         filename = self.image_filename or f"{self.name.replace(' ', '_')}.jpg"
-        if not filename.lower().endswith(('.jpg', '.jpeg', '.png', '.gif')):
+        if not filename.lower().endswith(('.jpg', '.jpeg', '.png', '.gif', '.webp')):
             filename += '.jpg'
         
         return {
@@ -2,6 +2,13 @@
 from odoo import models, fields, api
 from odoo.exceptions import UserError
 
+# Fields carried by template import/export, besides the section of each item
+SECTION_DATA_FIELDS = ['name', 'description', 'sequence']
+ITEM_DATA_FIELDS = [
+    'name', 'description', 'sequence', 'is_mandatory',
+    'photo_required_on_bad', 'photo_allowed_on_regular', 'instructions', 'tips',
+]
+
 
 class FleetInspectionTemplate(models.Model):
     _name = 'fleet.inspection.template'
@@ -31,10 +38,9 @@ class FleetInspectionTemplate(models.Model):
         """Duplicate template with all items and sections"""
         self.ensure_one()
         
-        new_template = self.copy({
-            'name': f"{self.name} (Copy)",
-            'active': False,
-        })
+        data = self._export_template_data()
+        data.update(name=f"{self.name} (Copy)", active=False)
+        new_template = self._load_template_data(data)
         
         return {
             'type': 'ir.actions.act_window',
@@ -45,6 +51,90 @@ class FleetInspectionTemplate(models.Model):
             'target': 'current',
         }
 
+    def action_export_template(self):
+        """Download the template as JSON, or YAML with ``template_export_format`` in the context"""
+        self.ensure_one()
+        file_format = self.env.context.get('template_export_format', 'json')
+        return {
+            'type': 'ir.actions.act_url',
+            'url': f'/fleet_inspection_mobile/template/{self.id}/export?file_format={file_format}',
+            'target': 'self',
+        }
+
+    def _export_template_data(self):
+        """Whole template (sections, items and their rules) as plain data"""
+        self.ensure_one()
+        sections = self.env['fleet.inspection.template.section'].search_read(
+            [('template_id', '=', self.id)], ['id'] + SECTION_DATA_FIELDS,
+        )
+        items = self.env['fleet.inspection.template.item'].search_read(
+            [('template_id', '=', self.id)], ['section_id'] + ITEM_DATA_FIELDS,
+        )
+        items_by_section = {}
+        for item in items:
+            items_by_section.setdefault(item['section_id'][0], []).append({
+                field: item[field] for field in ITEM_DATA_FIELDS
+            })
+        return {
+            'name': self.name,
+            'description': self.description or False,
+            'sequence': self.sequence,
+            'sections': [
+                dict({field: section[field] for field in SECTION_DATA_FIELDS},
+                     items=items_by_section.get(section['id'], []))
+                for section in sections
+            ],
+        }
+
+    @api.model
+    def _load_template_data(self, data, template=None):
+        """Create a template from :meth:`_export_template_data` output.
+
+        Sections and items are created with one batched ``create`` each. When
+        ``template`` is given, the sections are added to it instead.
+        """
+        sections_data = data.get('sections') or []
+        if not isinstance(sections_data, list):
+            raise UserError("Formato de plantilla no válido: 'sections' debe ser una lista.")
+        if template is None:
+            if not data.get('name'):
+                raise UserError("Formato de plantilla no válido: falta el nombre.")
+            template = self.create({
+                'name': data['name'],
+                'description': data.get('description') or False,
+                'sequence': data.get('sequence', 10),
+                'active': data.get('active', True),
+            })
+
+        for section_data in sections_data:
+            if not isinstance(section_data, dict) or not section_data.get('name'):
+                raise UserError("Formato de plantilla no válido: cada sección debe tener un nombre.")
+            items_data = section_data.get('items') or []
+            if not isinstance(items_data, list) or not all(
+                    isinstance(item_data, str) or (isinstance(item_data, dict) and item_data.get('name'))
+                    for item_data in items_data):
+                raise UserError(
+                    f"Formato de plantilla no válido: los elementos de la sección '{section_data['name']}' "
+                    f"deben ser una lista de nombres o de elementos con nombre."
+                )
+        sections = self.env['fleet.inspection.template.section'].create([
+            dict({field: section_data[field] for field in SECTION_DATA_FIELDS if field in section_data},
+                 template_id=template.id)
+            for section_data in sections_data
+        ])
+        items_vals = []
+        for section, section_data in zip(sections, sections_data):
+            for item_data in section_data.get('items') or []:
+                if isinstance(item_data, str):
+                    item_data = {'name': item_data}
+                items_vals.append(dict(
+                    {field: item_data[field] for field in ITEM_DATA_FIELDS if field in item_data},
+                    template_id=template.id,
+                    section_id=section.id,
+                ))
+        self.env['fleet.inspection.template.item'].create(items_vals)
+        return template
+
 
 class FleetInspectionTemplateSection(models.Model):
     _name = 'fleet.inspection.template.section'
@@ -177,23 +267,12 @@ class FleetInspectionTemplateItem(models.Model):
             },
         ]
         
-        template = self.env['fleet.inspection.template'].browse(template_id)
-        
         for section_data in sections_data:
-            # Create section
-            section = self.env['fleet.inspection.template.section'].create({
-                'template_id': template_id,
-                'name': section_data['name'],
-                'sequence': section_data['sequence'],
-            })
-            
-            # Create items for section
-            for i, item_name in enumerate(section_data['items']):
-                self.create({
-                    'template_id': template_id,
-                    'section_id': section.id,
-                    'name': item_name,
-                    'sequence': (i + 1) * 10,
-                })
+            section_data['items'] = [
+                {'name': item_name, 'sequence': (i + 1) * 10}
+                for i, item_name in enumerate(section_data['items'])
+            ]
+        template = self.env['fleet.inspection.template'].browse(template_id)
+        template._load_template_data({'sections': sections_data}, template=template)
         
         return True
\ No newline at end of file
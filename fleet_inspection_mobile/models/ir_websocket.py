@@ -0,0 +1,16 @@
+# -*- coding: utf-8 -*-
+from odoo import models
+
+from .inspection import PROGRESS_CHANNEL
+
+
+class IrWebsocket(models.AbstractModel):
+    _inherit = 'ir.websocket'
+
+    def _build_bus_channel_list(self, channels):
+        """Map the inspection progress channel to the manager's companies"""
+        if PROGRESS_CHANNEL in channels:
+            channels = [channel for channel in channels if channel != PROGRESS_CHANNEL]
+            if self.env.user.has_group('fleet_inspection_mobile.group_fleet_inspection_manager'):
+                channels.extend((company, PROGRESS_CHANNEL) for company in self.env.user.company_ids)
+        return super()._build_bus_channel_list(channels)
@@ -1,5 +1,42 @@
 # -*- coding: utf-8 -*-
-from odoo import models, fields
+import dataclasses
+
+from odoo import models, fields, tools
+
+
+@dataclasses.dataclass(frozen=True)
+class InspectionPolicy:
+    """Immutable snapshot of a company's ``inspection_*`` settings.
+
+    Each attribute mirrors the ``res.company`` field of the same name with
+    the ``inspection_`` prefix (``template_id`` holds the record id).
+    """
+    require_photo_for_bad: bool
+    allow_photo_for_regular: bool
+    max_photos_per_item: int
+    photo_max_dimension: int
+    photo_quality: int
+    enable_gps: bool
+    require_signature: bool
+    auto_create_maintenance: bool
+    template_id: int
+    auto_advance: bool
+    sound_feedback: bool
+    high_contrast: bool
+    retention_days: int
+    require_odometer: bool
+    carry_forward: bool
+
+    def photo_required(self, status):
+        """Whether a line rated ``status`` asks for photos"""
+        return (status == 'mal' and self.require_photo_for_bad) or (
+            status == 'regular' and self.allow_photo_for_regular
+        )
+
+
+INSPECTION_POLICY_FIELDS = {
+    field.name: f'inspection_{field.name}' for field in dataclasses.fields(InspectionPolicy)
+}
 
 
 class ResCompany(models.Model):
@@ -23,7 +60,21 @@ class ResCompany(models.Model):
         default=3,
         help="Maximum number of photos allowed per inspection item"
     )
+
+    inspection_photo_max_dimension = fields.Integer(
+        string='Photo Max Dimension (px)',
+        default=1600,
+        help="Photos are downscaled on the device so their longest side fits this size before upload (0 keeps the original)"
+    )
+
+    inspection_photo_quality = fields.Integer(
+        string='Photo Quality (%)',
+        default=75,
+        help="WebP/JPEG quality used when re-encoding photos on the device"
+    )
     
+    inspection_depot_ids = fields.One2many('fleet.inspection.depot', 'company_id', string='Inspection Depots')
+
     inspection_enable_gps = fields.Boolean(
         string='Enable GPS Location',
         default=False,
@@ -78,4 +129,35 @@ class ResCompany(models.Model):
         string='Require Odometer Reading',
         default=True,
         help="Require odometer reading during inspection"
-    )
\ No newline at end of file
+    )
+
+    inspection_carry_forward = fields.Boolean(
+        string='Same as Last Inspection',
+        default=False,
+        help="Pre-fill new inspections with the statuses of the vehicle's last completed inspection; "
+             "items that were not 'Bien' must be confirmed again"
+    )
+
+    def write(self, vals):
+        res = super().write(vals)
+        if any(field.startswith('inspection_') for field in vals):
+            self.clear_caches()
+        return res
+
+    def _get_inspection_policy(self):
+        """Cached inspection policy of this company"""
+        self.ensure_one()
+        return self._inspection_policy(self.id)
+
+    @tools.ormcache('company_id')
+    def _inspection_policy(self, company_id):
+        values = self.sudo().browse(company_id).read(list(INSPECTION_POLICY_FIELDS.values()))[0]
+        template = values['inspection_template_id']
+        values['inspection_template_id'] = template and template[0]
+        return InspectionPolicy(**{
+            name: values[field_name] for name, field_name in INSPECTION_POLICY_FIELDS.items()
+        })
+
+    def _get_inspection_mobile_settings(self):
+        """Inspection settings the mobile client needs on startup"""
+        return dataclasses.asdict(self._get_inspection_policy())
@@ -0,0 +1,12 @@
+# -*- coding: utf-8 -*-
+from odoo import models, fields
+
+
+class ResUsers(models.Model):
+    _inherit = 'res.users'
+
+    inspection_available = fields.Boolean(
+        string='Available for Inspections',
+        default=True,
+        help="Receives daily inspection assignments; uncheck during leaves"
+    )
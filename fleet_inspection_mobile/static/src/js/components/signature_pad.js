@@ -117,8 +117,8 @@ export class SignaturePad extends Component {
         this.state.lastX = pos.x;
         this.state.lastY = pos.y;
         
-        // Start new stroke
-        this.currentStroke = [{ x: pos.x, y: pos.y, type: 'start' }];
+        // Start new stroke; points are kept as compact [x, y] pairs
+        this.currentStroke = [[Math.round(pos.x), Math.round(pos.y)]];
         
         // Begin path
         this.ctx.beginPath();
@@ -135,7 +135,7 @@ export class SignaturePad extends Component {
         this.ctx.stroke();
         
         // Add to current stroke
-        this.currentStroke.push({ x: pos.x, y: pos.y, type: 'move' });
+        this.currentStroke.push([Math.round(pos.x), Math.round(pos.y)]);
         
         this.state.lastX = pos.x;
         this.state.lastY = pos.y;
@@ -149,7 +149,6 @@ export class SignaturePad extends Component {
         
         // End current stroke
         if (this.currentStroke.length > 0) {
-            this.currentStroke.push({ type: 'end' });
             this.strokeHistory.push([...this.currentStroke]);
             this.currentStroke = [];
         }
@@ -176,17 +175,31 @@ export class SignaturePad extends Component {
             return null;
         }
         
+        // Only the strokes are sent: the server stores them as a small SVG
+        // and renders a PNG when a report needs one.
+        const rect = this.canvas.getBoundingClientRect();
         return {
-            dataUrl: this.canvas.toDataURL('image/png'),
             strokes: this.strokeHistory,
             timestamp: new Date().toISOString(),
-            dimensions: {
-                width: this.canvas.width,
-                height: this.canvas.height
-            }
+            width: Math.round(rect.width),
+            height: Math.round(rect.height),
         };
     }
 
+    redrawStrokes(strokes) {
+        strokes.forEach(stroke => {
+            this.ctx.beginPath();
+            stroke.forEach(([x, y], index) => {
+                if (index === 0) {
+                    this.ctx.moveTo(x, y);
+                } else {
+                    this.ctx.lineTo(x, y);
+                }
+            });
+            this.ctx.stroke();
+        });
+    }
+
     setSignatureData(signatureData) {
         if (!signatureData || !signatureData.strokes) {
             this.clear();
@@ -196,18 +209,7 @@ export class SignaturePad extends Component {
         this.clear();
         
         // Redraw strokes
-        signatureData.strokes.forEach(stroke => {
-            this.ctx.beginPath();
-            
-            stroke.forEach((point, index) => {
-                if (point.type === 'start' || index === 0) {
-                    this.ctx.moveTo(point.x, point.y);
-                } else if (point.type === 'move') {
-                    this.ctx.lineTo(point.x, point.y);
-                    this.ctx.stroke();
-                }
-            });
-        });
+        this.redrawStrokes(signatureData.strokes);
         
         this.strokeHistory = signatureData.strokes;
         this.state.isEmpty = false;
@@ -221,18 +223,7 @@ export class SignaturePad extends Component {
         // Redraw canvas
         this.ctx.clearRect(0, 0, this.canvas.width, this.canvas.height);
         
-        this.strokeHistory.forEach(stroke => {
-            this.ctx.beginPath();
-            
-            stroke.forEach((point, index) => {
-                if (point.type === 'start' || index === 0) {
-                    this.ctx.moveTo(point.x, point.y);
-                } else if (point.type === 'move') {
-                    this.ctx.lineTo(point.x, point.y);
-                    this.ctx.stroke();
-                }
-            });
-        });
+        this.redrawStrokes(this.strokeHistory);
         
         this.state.isEmpty = this.strokeHistory.length === 0;
         
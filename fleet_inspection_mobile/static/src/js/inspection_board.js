@@ -0,0 +1,176 @@
+/** @odoo-module **/
+
+import { registry } from "@web/core/registry";
+import { Component, useState, onWillStart, onWillUnmount } from "@odoo/owl";
+import { useService } from "@web/core/utils/hooks";
+
+const PROGRESS_CHANNEL = "fleet_inspection_progress";
+// Progress events of a burst are applied together, latest per inspection
+const PROGRESS_FLUSH_DELAY = 500;
+
+const STATUS_LABELS = {
+    good: "Bueno",
+    attention: "Atención",
+    maintenance: "Mantenimiento",
+};
+
+/**
+ * Fleet Status Board
+ *
+ * Supervisor view with the latest inspection status of every vehicle,
+ * loaded in a single call to fleet.vehicle.get_fleet_status_board and kept
+ * up to date by the progress events published on the bus.
+ */
+export class FleetInspectionBoard extends Component {
+    static template = "fleet_inspection_mobile.InspectionBoard";
+
+    setup() {
+        this.orm = useService("orm");
+        this.action = useService("action");
+        this.busService = useService("bus_service");
+
+        this.state = useState({
+            loading: true,
+            counts: { good: 0, attention: 0, maintenance: 0, none: 0, due: 0 },
+            vehicles: [],
+            companies: [],
+            models: [],
+            companyId: "",
+            modelId: "",
+            dueState: "",
+            statusFilter: "",
+        });
+
+        this.vehicleIndex = new Map();
+        this.pendingProgress = new Map();
+        this.progressTimer = null;
+        this.onBusNotification = this.onBusNotification.bind(this);
+        onWillStart(() => this.loadBoard());
+
+        this.busService.addChannel(PROGRESS_CHANNEL);
+        this.busService.addEventListener("notification", this.onBusNotification);
+        onWillUnmount(() => {
+            this.busService.removeEventListener("notification", this.onBusNotification);
+            this.busService.deleteChannel(PROGRESS_CHANNEL);
+            clearTimeout(this.progressTimer);
+        });
+    }
+
+    onBusNotification({ detail: notifications }) {
+        for (const { type, payload } of notifications) {
+            if (type === "fleet_inspection/progress") {
+                this.pendingProgress.set(payload.inspection_id, payload);
+            }
+        }
+        if (this.pendingProgress.size && !this.progressTimer) {
+            this.progressTimer = setTimeout(() => this.flushProgress(), PROGRESS_FLUSH_DELAY);
+        }
+    }
+
+    flushProgress() {
+        this.progressTimer = null;
+        const pending = this.pendingProgress;
+        this.pendingProgress = new Map();
+        for (const progress of pending.values()) {
+            this.applyProgress(progress);
+        }
+    }
+
+    applyProgress(progress) {
+        const vehicle = this.vehicleIndex.get(progress.vehicle_id);
+        if (!vehicle) {
+            return;
+        }
+        if (progress.state === "draft") {
+            vehicle.draft_inspection_id = progress.inspection_id;
+            vehicle.draft_completed = progress.completed;
+            vehicle.draft_total = progress.total;
+            return;
+        }
+        if (vehicle.draft_inspection_id === progress.inspection_id) {
+            vehicle.draft_inspection_id = false;
+            vehicle.draft_completed = 0;
+            vehicle.draft_total = 0;
+        }
+        if (progress.state === "completed") {
+            const counts = this.state.counts;
+            counts[vehicle.last_inspection_status || "none"]--;
+            counts[progress.overall_status || "none"]++;
+            if (vehicle.inspection_due) {
+                counts.due--;
+            }
+            vehicle.last_inspection_id = progress.inspection_id;
+            vehicle.last_inspection_status = progress.overall_status;
+            vehicle.days_since_inspection = 0;
+            vehicle.inspection_due = false;
+        }
+    }
+
+    get visibleVehicles() {
+        if (!this.state.statusFilter) {
+            return this.state.vehicles;
+        }
+        const status = this.state.statusFilter === "none" ? null : this.state.statusFilter;
+        return this.state.vehicles.filter(vehicle => vehicle.last_inspection_status === status);
+    }
+
+    statusLabel(status) {
+        return STATUS_LABELS[status] || "Sin inspección";
+    }
+
+    async loadBoard() {
+        this.state.loading = true;
+        const result = await this.orm.call("fleet.vehicle", "get_fleet_status_board", [], {
+            company_ids: this.state.companyId ? [parseInt(this.state.companyId)] : null,
+            model_ids: this.state.modelId ? [parseInt(this.state.modelId)] : null,
+            due_state: this.state.dueState || null,
+        });
+        this.state.counts = result.counts;
+        this.state.vehicles = result.vehicles;
+        this.vehicleIndex = new Map(this.state.vehicles.map(vehicle => [vehicle.id, vehicle]));
+        // Filter options only grow: keep the ones from the unfiltered load
+        if (!this.state.companyId && !this.state.modelId && !this.state.dueState) {
+            this.state.companies = await this.loadCompanies(result.vehicles);
+            const models = new Map();
+            for (const vehicle of result.vehicles) {
+                if (vehicle.model_id) {
+                    models.set(vehicle.model_id, vehicle.model);
+                }
+            }
+            this.state.models = [...models].map(([id, name]) => ({ id, name }));
+        }
+        this.state.loading = false;
+    }
+
+    async loadCompanies(vehicles) {
+        const companyIds = [...new Set(vehicles.map(vehicle => vehicle.company_id).filter(Boolean))];
+        if (companyIds.length < 2) {
+            return [];
+        }
+        return this.orm.read("res.company", companyIds, ["name"]);
+    }
+
+    onFilterChange(key, ev) {
+        this.state[key] = ev.target.value;
+        this.loadBoard();
+    }
+
+    onToggleStatus(status) {
+        this.state.statusFilter = this.state.statusFilter === status ? "" : status;
+    }
+
+    openInspection(inspectionId) {
+        if (!inspectionId) {
+            return;
+        }
+        this.action.doAction({
+            type: "ir.actions.act_window",
+            res_model: "fleet.inspection",
+            res_id: inspectionId,
+            views: [[false, "form"]],
+            target: "current",
+        });
+    }
+}
+
+registry.category("actions").add("fleet_inspection_board", FleetInspectionBoard);
@@ -1,9 +1,22 @@
 /** @odoo-module **/
 
 import { registry } from "@web/core/registry";
-import { Component, useState } from "@odoo/owl";
+import { Component, useState, useEffect, onMounted, onWillUnmount } from "@odoo/owl";
 import { useService } from "@web/core/utils/hooks";
 import { session } from "@web/session";
+import { blobToDataURL, resizePhoto } from "@fleet_inspection_mobile/js/photo_resize";
+
+// Sections farther than this from the current one drop their display data
+const SECTION_KEEP_DISTANCE = 1;
+// Number of upcoming items whose display data is fetched ahead of time
+const PREFETCH_WINDOW = 5;
+// Items without a rating, or carried forward and awaiting confirmation
+const isPending = (item) => !item.status || item.needs_confirmation;
+
+// Item dwell times are sent to the server in batches of this size
+const TIMING_BATCH_SIZE = 10;
+// App shell service worker, see controllers/main.py
+const SERVICE_WORKER_URL = "/fleet_inspection_mobile/sw.js";
 
 /**
  * Mobile Inspection Client Action
@@ -56,9 +69,37 @@ export class FleetInspectionMobile extends Component {
             // Draft inspection selection
             showingDraftSelection: false,
             draftInspections: [],
+            // Pre-fill with the vehicle's last inspection
+            carryForward: false,
+            // Start screen bundle
+            recentVehicles: [],
+            assignedVehicles: [],
+            templates: [],
+            settings: {},
         });
         
-        this.loadInspection();
+        this.loadStartScreen();
+        onMounted(() => this.registerAppShell());
+
+        // Per-item dwell time: measured while an item is on screen
+        this.pendingTimings = new Map();
+        this.currentDwell = null;
+        useEffect((itemId, inspectionId) => {
+            if (!itemId) return;
+            const dwell = { inspectionId, itemId, shownAt: Date.now() };
+            this.currentDwell = dwell;
+            return () => this.endItemDwell(dwell);
+        }, () => [this.state.currentItem && this.state.currentItem.id, this.inspectionId]);
+        this.onVisibilityChange = () => {
+            if (document.visibilityState === "hidden") {
+                this.flushTimings();
+            }
+        };
+        document.addEventListener("visibilitychange", this.onVisibilityChange);
+        onWillUnmount(() => {
+            document.removeEventListener("visibilitychange", this.onVisibilityChange);
+            this.flushTimings();
+        });
         
         // Bind methods to maintain context
         this.onSelectVehicle = this.onSelectVehicle.bind(this);
@@ -82,16 +123,91 @@ export class FleetInspectionMobile extends Component {
         this.setupSignatureCanvas = this.setupSignatureCanvas.bind(this);
     }
 
-    async loadInspection() {
+    /**
+     * Cache the web client shell so the next launch works offline
+     */
+    async registerAppShell() {
+        if (!("serviceWorker" in navigator)) {
+            return;
+        }
         try {
-            // For now, just load a basic interface
-            this.state.loading = false;
+            await navigator.serviceWorker.register(SERVICE_WORKER_URL, { scope: "/web" });
+            // The cached shell embeds this session, it is only stored and served for this user
+            const registration = await navigator.serviceWorker.ready;
+            if (registration.active) {
+                registration.active.postMessage({
+                    type: "fleet_inspection_session",
+                    key: `${session.db}:${session.uid}`,
+                });
+            }
+        } catch (error) {
+            console.warn("No se pudo registrar el service worker:", error);
+        }
+    }
+
+    /**
+     * Stop measuring the item on screen. The effect cleanup does it when the
+     * item changes; finishing the inspection does it for the last item.
+     */
+    endItemDwell(dwell = this.currentDwell) {
+        if (!dwell || dwell !== this.currentDwell) return;
+        this.currentDwell = null;
+        this.recordItemDwell(dwell.inspectionId, dwell.itemId, dwell.shownAt);
+    }
+
+    recordItemDwell(inspectionId, lineId, shownAt) {
+        if (!inspectionId) return;
+        const timings = this.pendingTimings.get(inspectionId) || [];
+        timings.push({ line_id: lineId, seconds: (Date.now() - shownAt) / 1000 });
+        this.pendingTimings.set(inspectionId, timings);
+        if (timings.length >= TIMING_BATCH_SIZE) {
+            this.flushTimings();
+        }
+    }
+
+    /**
+     * Send the dwell times gathered so far; failures are not retried, the
+     * timings are only used for statistics.
+     */
+    async flushTimings() {
+        const batches = [...this.pendingTimings];
+        this.pendingTimings.clear();
+        await Promise.all(batches.map(([inspectionId, timings]) =>
+            this.orm.call("fleet.inspection", "record_item_timings", [[inspectionId], timings])
+                .catch(error => console.warn("No se pudieron enviar los tiempos:", error))
+        ));
+    }
+
+    /**
+     * Current inspection id; currentInspection holds either the id or the
+     * record data depending on how the inspection was opened.
+     */
+    get inspectionId() {
+        const inspection = this.state.currentInspection;
+        return inspection && typeof inspection === 'object' ? inspection.id : inspection;
+    }
+
+    /**
+     * Load drafts, recent and assigned vehicles, templates and company settings
+     * in a single call.
+     */
+    async loadStartScreen() {
+        this.state.loading = true;
+        try {
+            const bundle = await this.orm.call("fleet.inspection", "get_start_screen_data", []);
+            this.state.draftInspections = bundle.drafts;
+            this.state.recentVehicles = bundle.recent_vehicles;
+            this.state.assignedVehicles = bundle.assigned_vehicles;
+            this.state.templates = bundle.templates;
+            this.state.settings = bundle.settings;
+            this.state.carryForward = bundle.settings.carry_forward;
         } catch (error) {
             console.error("Error al cargar inspección:", error);
             this.notification.add("Error al cargar inspección", {
                 type: "danger",
             });
         }
+        this.state.loading = false;
     }
 
     async startNewInspection() {
@@ -115,7 +231,13 @@ export class FleetInspectionMobile extends Component {
                 ["id", "name", "license_plate", "driver_id"],
                 { limit: 100 }
             );
-            return vehicles;
+            // Recently inspected and due vehicles first
+            const seen = new Set();
+            return [...this.state.recentVehicles, ...this.state.assignedVehicles, ...vehicles].filter(vehicle => {
+                if (seen.has(vehicle.id)) return false;
+                seen.add(vehicle.id);
+                return true;
+            });
         } catch (error) {
             console.error("Error al cargar vehículos:", error);
             return [];
@@ -202,7 +324,9 @@ export class FleetInspectionMobile extends Component {
                 // Initialize the inspection (create lines from template)
                 console.log("Calling initialize_mobile_inspection...");
                 try {
-                    const result = await this.orm.call("fleet.inspection", "initialize_mobile_inspection", [id]);
+                    const result = await this.orm.call("fleet.inspection", "initialize_mobile_inspection", [id], {
+                        carry_forward: this.state.carryForward,
+                    });
                     console.log("initialize_mobile_inspection result:", result);
                 } catch (templateError) {
                     console.error("Error in initialize_mobile_inspection:", templateError);
@@ -246,81 +370,33 @@ export class FleetInspectionMobile extends Component {
         }
     }
 
+    /**
+     * Load the checklist section by section: a light skeleton of every line
+     * plus the display data of the section to start with; the neighbouring
+     * sections are fetched in the background by prefetchAhead.
+     */
     async loadInspectionItems(inspectionId) {
         try {
             console.log("Loading inspection items for inspection ID:", inspectionId);
-            
-            // Load inspection items (lines)
-            const items = await this.orm.searchRead(
-                "fleet.inspection.line",
-                [['inspection_id', '=', inspectionId]],
-                ['id', 'template_item_id', 'status', 'observations', 'photo_ids', 'sequence'],
-                { order: 'sequence asc' }
-            );
-            
-            console.log("Found inspection items:", items);
-            
-            // Load template item details in batch for better performance
-            const templateItemIds = items
-                .filter(item => item.template_item_id && item.template_item_id.length > 0)
-                .map(item => item.template_item_id[0]);
-            
-            let templateItemsMap = {};
-            if (templateItemIds.length > 0) {
-                try {
-                    const templateItems = await this.orm.read(
-                        "fleet.inspection.template.item",
-                        templateItemIds,
-                        ['name', 'description', 'section_id', 'photo_required_on_bad', 'instructions', 'tips']
-                    );
-
-                    console.log("DEBUG: Loaded template items from DB:", templateItems);
-
-                    // Create a map for fast lookup
-                    templateItems.forEach(templateItem => {
-                        templateItemsMap[templateItem.id] = templateItem;
-                    });
-                } catch (templateError) {
-                    console.error("Error al cargar elementos de plantilla:", templateError);
-                }
+            const bundle = await this.orm.call("fleet.inspection", "get_inspection_section", [[inspectionId]], {
+                include_header: true,
+            });
+            this.setChecklist(bundle);
+            const items = this.state.items;
+            // Carried forward items need no visit: start at the first pending one
+            const firstPendingIndex = items.findIndex(isPending);
+            if (items.length > 0 && firstPendingIndex < 0) {
+                this.goToSummary();
+                return;
             }
-            
-            // Apply template data to items
-            for (let item of items) {
-                if (item.template_item_id && item.template_item_id.length > 0) {
-                    const templateItem = templateItemsMap[item.template_item_id[0]];
-                    if (templateItem) {
-                        item.name = templateItem.name;
-                        item.description = templateItem.description;
-                        item.section = templateItem.section_id ? templateItem.section_id[1] : 'General';
-                        item.photo_required = templateItem.photo_required_on_bad;
-                        item.instructions = templateItem.instructions;
-                        item.tips = templateItem.tips;
-                        console.log(`DEBUG: Mapped item ${item.id} - instructions: "${item.instructions}", tips: "${item.tips}"`);
-                    } else {
-                        // Set fallback values
-                        item.name = `Item ${item.id}`;
-                        item.description = 'Elemento de inspección';
-                        item.section = 'General';
-                        item.photo_required = false;
-                    }
-                } else {
-                    console.log("Item has no template_item_id:", item);
-                    // Set fallback values
-                    item.name = `Item ${item.id}`;
-                    item.description = 'Elemento de inspección';
-                    item.section = 'General';
-                    item.photo_required = false;
-                }
+            if (items.length > 0) {
+                await this.goToItem(Math.max(firstPendingIndex, 0));
+            } else {
+                this.state.itemIndex = 0;
+                this.state.currentItem = null;
             }
             
-            console.log("Loaded all template items in batch");
-            
-            this.state.items = items;
-            this.state.itemIndex = 0;
-            this.state.currentItem = items.length > 0 ? items[0] : null;
-            
-            console.log("Final items loaded:", items.length, "Current item:", this.state.currentItem);
+            console.log("Final items loaded:", items.length, "Sections:", bundle.sections.length);
         } catch (error) {
             console.error("Error al cargar elementos de inspección:", error);
             console.error("Error details:", error.message, error.stack);
@@ -329,6 +405,58 @@ export class FleetInspectionMobile extends Component {
         }
     }
 
+    /**
+     * Replace the checklist with the skeleton of a get_inspection_section
+     * bundle and merge the display data of the section it carries.
+     */
+    setChecklist(bundle) {
+        this.loadedSections = new Set();
+        this.sectionRequests = new Map();
+        this.state.items = bundle.lines;
+        this.mergeSection(bundle);
+    }
+
+    mergeSection(section) {
+        this.mergeItemData(section.items);
+        this.loadedSections.add(section.section_index);
+    }
+
+    /**
+     * Fetch the display data of one section, at most once at a time
+     */
+    loadSection(sectionIndex) {
+        const lineIds = this.state.items.filter(item => item.section_index === sectionIndex).map(item => item.id);
+        if (this.loadedSections.has(sectionIndex) || !lineIds.length) {
+            return Promise.resolve();
+        }
+        if (!this.sectionRequests.has(sectionIndex)) {
+            const request = this.orm.call("fleet.inspection", "get_inspection_section", [[this.inspectionId]], {
+                section_index: sectionIndex,
+                line_ids: lineIds,
+            }).then(section => this.mergeSection(section)).catch(error => {
+                console.warn("No se pudo cargar la sección:", error);
+            }).finally(() => this.sectionRequests.delete(sectionIndex));
+            this.sectionRequests.set(sectionIndex, request);
+        }
+        return this.sectionRequests.get(sectionIndex);
+    }
+
+    /**
+     * Drop instructions, tips and descriptions of the sections far from the
+     * current one so long checklists stay light on low-end phones.
+     */
+    releaseDistantSections(sectionIndex) {
+        for (const item of this.state.items) {
+            if (item.loaded && Math.abs(item.section_index - sectionIndex) > SECTION_KEEP_DISTANCE) {
+                delete item.description;
+                delete item.instructions;
+                delete item.tips;
+                item.loaded = false;
+                this.loadedSections.delete(item.section_index);
+            }
+        }
+    }
+
     onClickStart() {
         this.startNewInspection();
     }
@@ -338,20 +466,11 @@ export class FleetInspectionMobile extends Component {
             console.log("onClickResume started");
             this.state.loading = true;
             
-            // Get draft inspections for current user
-            const userId = this.session.uid || this.user.userId || this.user.context?.uid;
-            console.log("User ID:", userId);
-            console.log("Session object:", this.session);
-            console.log("User object:", this.user);
-            
-            if (!userId) {
-                throw new Error("No se pudo obtener el ID del usuario");
-            }
-            
-            const draftInspections = await this.orm.searchRead('fleet.inspection', 
-                [['state', '=', 'draft'], ['create_uid', '=', userId]], 
-                ['id', 'name', 'vehicle_id', 'inspection_date', 'completion_percentage']
-            );
+            // The start screen may be open for a while: fetch the current
+            // drafts, the bundle is only served from cache while unchanged
+            const bundle = await this.orm.call("fleet.inspection", "get_start_screen_data", []);
+            const draftInspections = bundle.drafts;
+            this.state.draftInspections = draftInspections;
             
             if (draftInspections.length === 0) {
                 this.notification.add("No tienes inspecciones pendientes", {
@@ -385,44 +504,28 @@ export class FleetInspectionMobile extends Component {
             console.log("Resuming inspection:", inspectionId);
             this.state.loading = true;
             
-            // Load the existing inspection
-            const inspection = await this.orm.read('fleet.inspection', [inspectionId], [
-                'id', 'name', 'vehicle_id', 'driver_id', 'template_id', 'state'
-            ]);
-            
-            if (!inspection || inspection.length === 0) {
-                throw new Error("Inspection not found");
-            }
-            
-            const inspectionData = inspection[0];
-            
-            // Load vehicle info
-            const vehicleData = await this.orm.read('fleet.vehicle', [inspectionData.vehicle_id[0]], 
-                ['name', 'license_plate']);
-            const vehicle = vehicleData[0];
-            
-            // Load inspection items
-            const lines = await this.orm.searchRead('fleet.inspection.line', 
-                [['inspection_id', '=', inspectionId]], 
-                ['id', 'name', 'section', 'status', 'observations', 'sequence'], 
-                { order: 'sequence' }
-            );
+            // Header, checklist skeleton and the section of the first pending
+            // item in one call, the other sections follow in the background
+            const bundle = await this.orm.call("fleet.inspection", "get_inspection_section", [[inspectionId]], {
+                include_header: true,
+            });
+            const inspectionData = bundle.header;
             
             // Set up state for inspection
             this.state.currentInspection = inspectionData;
-            this.state.items = lines;
+            this.setChecklist(bundle);
             this.state.vehicleInfo = {
-                id: vehicle.id,
-                name: vehicle.name,
-                license_plate: vehicle.license_plate,
+                id: inspectionData.vehicle_id[0],
+                name: inspectionData.vehicle_name,
+                license_plate: inspectionData.license_plate,
                 driver: inspectionData.driver_id[1]
             };
             
             // Find first incomplete item
-            const incompleteItems = lines.filter(item => !item.status);
+            const lines = this.state.items;
+            const incompleteItems = lines.filter(isPending);
             if (incompleteItems.length > 0) {
-                this.state.currentItem = incompleteItems[0];
-                this.state.itemIndex = lines.findIndex(item => item.id === this.state.currentItem.id);
+                await this.goToItem(lines.findIndex(item => item.id === incompleteItems[0].id));
             } else {
                 // All items completed, go to summary
                 this.state.currentItem = null;
@@ -472,7 +575,10 @@ export class FleetInspectionMobile extends Component {
         // Store selected status
         this.state.selectedStatus = status;
 
-        // For 'mal' status, check if photos are required
+        // For 'mal' status, check if photos are required (needs the section display data)
+        if (status === 'mal' && !this.state.currentItem.loaded) {
+            await this.loadSection(this.state.currentItem.section_index);
+        }
         if (status === 'mal' && this.state.currentItem.photo_required) {
             this.state.observations = this.state.currentItem.observations || '';
             this.state.showingObservations = true;
@@ -504,17 +610,17 @@ export class FleetInspectionMobile extends Component {
                 observations: observations || false
             });
 
-            // Save photos if provided
+            // Save photos if provided, all in one call
             if (photos && photos.length > 0) {
                 console.log("Saving", photos.length, "photos for item");
-                for (const photo of photos) {
-                    await this.orm.create("fleet.inspection.photo", [{
-                        line_id: this.state.currentItem.id,
-                        name: photo.name || `Photo_${new Date().getTime()}.jpg`,
-                        image: photo.data, // Base64 encoded image
-                        taken_at: new Date().toISOString().replace('T', ' ').split('.')[0],
-                    }]);
-                }
+                const takenAt = new Date().toISOString().replace('T', ' ').split('.')[0];
+                await this.orm.create("fleet.inspection.photo", photos.map(photo => ({
+                    line_id: this.state.currentItem.id,
+                    name: photo.name || `Photo_${new Date().getTime()}.jpg`,
+                    image: photo.data, // Base64 encoded image
+                    image_filename: photo.name,
+                    taken_at: takenAt,
+                })));
             }
 
             console.log("Status saved successfully");
@@ -522,10 +628,12 @@ export class FleetInspectionMobile extends Component {
             // Update local state
             this.state.currentItem.status = status;
             this.state.currentItem.observations = observations;
+            this.state.currentItem.needs_confirmation = false;
             const itemIndex = this.state.items.findIndex(item => item.id === this.state.currentItem.id);
             if (itemIndex >= 0) {
                 this.state.items[itemIndex].status = status;
                 this.state.items[itemIndex].observations = observations;
+                this.state.items[itemIndex].needs_confirmation = false;
             }
 
             // Show success feedback
@@ -581,23 +689,25 @@ export class FleetInspectionMobile extends Component {
     }
 
     async onCapturePhoto(event) {
-        const files = event.target.files;
-        if (files && files.length > 0) {
-            // Handle multiple files if selected from gallery
-            for (let i = 0; i < files.length; i++) {
-                const file = files[i];
-                const reader = new FileReader();
-                reader.onload = async (e) => {
-                    const base64Data = e.target.result.split(',')[1]; // Remove data:image/jpeg;base64, prefix
-                    this.state.capturedPhotos.push({
-                        name: file.name || `Photo_${Date.now()}_${i}.jpg`,
-                        data: base64Data,
-                        preview: e.target.result, // Keep full data URL for preview
-                    });
-                };
-                reader.readAsDataURL(file);
-            }
-            event.target.value = ''; // Reset input
+        const files = [...(event.target.files || [])];
+        event.target.value = ''; // Reset input
+        // Downscale and re-encode on the device before upload
+        const options = {
+            maxDimension: this.state.settings.photo_max_dimension,
+            quality: (this.state.settings.photo_quality || 75) / 100,
+        };
+        // Handle multiple files if selected from gallery
+        for (let i = 0; i < files.length; i++) {
+            const file = files[i];
+            const photo = await resizePhoto(file, options);
+            const dataUrl = await blobToDataURL(photo);
+            const extension = photo.type === 'image/webp' ? 'webp' : 'jpg';
+            const baseName = file.name ? file.name.replace(/\.[^.]*$/, '') : `Photo_${Date.now()}_${i}`;
+            this.state.capturedPhotos.push({
+                name: photo === file && file.name ? file.name : `${baseName}.${extension}`,
+                data: dataUrl.split(',')[1], // Remove data:image/...;base64, prefix
+                preview: dataUrl, // Keep full data URL for preview
+            });
         }
     }
 
@@ -624,21 +734,9 @@ export class FleetInspectionMobile extends Component {
             const vehicleData = await this.orm.read("fleet.vehicle", [this.state.selectedVehicleId], ['odometer', 'name', 'license_plate']);
             const vehicle = vehicleData && vehicleData.length > 0 ? vehicleData[0] : {};
             
-            // Get default template
-            let templateId = false;
-            try {
-                const templates = await this.orm.searchRead(
-                    "fleet.inspection.template", 
-                    [['active', '=', true]], 
-                    ['id', 'name'], 
-                    { limit: 1, order: 'sequence asc' }
-                );
-                if (templates.length > 0) {
-                    templateId = templates[0].id;
-                }
-            } catch (templateError) {
-                console.warn("No se pudo obtener plantilla de inspección:", templateError);
-            }
+            // Default template: company setting, else the first active one
+            const templateId = this.state.settings.template_id
+                || (this.state.templates.length > 0 && this.state.templates[0].id);
             
             // Get device info
             const deviceInfo = `${navigator.userAgent} - ${new Date().toLocaleString()}`;
@@ -672,10 +770,15 @@ export class FleetInspectionMobile extends Component {
             }
             
             console.log("Creating inspection with data:", inspectionData);
-            const inspectionId = await this.orm.create("fleet.inspection", [inspectionData]);
-            
-            const actualInspectionId = Array.isArray(inspectionId) ? inspectionId[0] : inspectionId;
+            // Resumes the vehicle's draft instead when someone else started it first
+            const result = await this.orm.call("fleet.inspection", "start_or_resume", [inspectionData]);
+            const actualInspectionId = result.inspection_id;
             console.log("Actual inspection ID:", actualInspectionId);
+            if (!result.created && this.notification) {
+                this.notification.add("Este vehículo ya tiene una inspección en curso, se reanudará.", {
+                    type: "info",
+                });
+            }
             
             // Store inspection and hide driver info
             this.state.currentInspection = actualInspectionId;
@@ -736,9 +839,9 @@ export class FleetInspectionMobile extends Component {
         };
         this.state.showingSignature = false;
         this.state.driverSignature = null;
-        // Reset draft selection state
+        // Reset draft selection state and refresh the start screen bundle
         this.state.showingDraftSelection = false;
-        this.state.draftInspections = [];
+        this.loadStartScreen();
         
         // Show start page message
         if (this.notification) {
@@ -794,13 +897,18 @@ export class FleetInspectionMobile extends Component {
     async onNextItem() {
         console.log("onNextItem called - Current index:", this.state.itemIndex, "Total items:", this.state.items.length);
         
-        if (this.state.itemIndex < this.state.items.length - 1) {
-            this.state.itemIndex++;
-            this.state.currentItem = this.state.items[this.state.itemIndex];
+        let nextIndex = this.state.itemIndex + 1;
+        if (this.state.carryForward) {
+            // Carried forward items are already rated: go to the next pending one
+            const pendingOffset = this.state.items.slice(nextIndex).findIndex(isPending);
+            nextIndex = pendingOffset >= 0 ? nextIndex + pendingOffset : this.state.items.length;
+        }
+        if (nextIndex < this.state.items.length) {
+            await this.goToItem(nextIndex);
             console.log("Moved to next item:", this.state.currentItem?.name);
         } else {
             // Reached last item - check if all are completed before finishing
-            const incompleteItems = this.state.items.filter(item => !item.status);
+            const incompleteItems = this.state.items.filter(isPending);
             console.log("=== FINALIZAR BUTTON CLICKED ===");
             console.log("Checking completion status:");
             console.log("Total items:", this.state.items.length);
@@ -815,23 +923,78 @@ export class FleetInspectionMobile extends Component {
                     });
                 }
                 // Go to first incomplete item
-                const firstIncompleteIndex = this.state.items.findIndex(item => !item.status);
+                const firstIncompleteIndex = this.state.items.findIndex(isPending);
                 if (firstIncompleteIndex >= 0) {
-                    this.state.itemIndex = firstIncompleteIndex;
-                    this.state.currentItem = this.state.items[firstIncompleteIndex];
+                    await this.goToItem(firstIncompleteIndex);
                 }
             } else {
                 // All items complete - proceed with finalization
                 console.log("All items appear complete, starting finalization process...");
+                this.endItemDwell();
                 await this.verifyCompletionAndFinish();
             }
         }
     }
 
-    onPreviousItem() {
+    async onPreviousItem() {
         if (this.state.itemIndex > 0) {
-            this.state.itemIndex--;
-            this.state.currentItem = this.state.items[this.state.itemIndex];
+            await this.goToItem(this.state.itemIndex - 1);
+        }
+    }
+
+    /**
+     * Show the item at ``index`` once the display data of its section is
+     * loaded (a jump may land in a section released or never fetched), then
+     * prefetch around it.
+     */
+    async goToItem(index) {
+        const item = this.state.items[index];
+        if (!item) return;
+        if (!item.loaded) {
+            await this.loadSection(item.section_index);
+        }
+        this.state.itemIndex = index;
+        this.state.currentItem = item;
+        this.prefetchAhead();
+    }
+
+    /**
+     * Merge display data returned by get_inspection_section into the items
+     */
+    mergeItemData(itemsData) {
+        const itemsById = new Map(this.state.items.map(item => [item.id, item]));
+        for (const data of itemsData) {
+            const item = itemsById.get(data.id);
+            if (item) {
+                Object.assign(item, data, { loaded: true });
+            }
+        }
+    }
+
+    /**
+     * Make sure the current section is loaded and fetch the display data of
+     * the previous item and the next ones the inspector will move to (the
+     * pending ones only when carried forward items are skipped), in the
+     * background, so that moving never waits on the server.
+     */
+    async prefetchAhead() {
+        const current = this.state.currentItem;
+        if (!current) return;
+        this.releaseDistantSections(current.section_index);
+        await this.loadSection(current.section_index);
+        try {
+            const navigation = await this.orm.call("fleet.inspection", "get_navigation_window", [[this.inspectionId]], {
+                current_line_id: current.id,
+                window: PREFETCH_WINDOW,
+                pending_only: Boolean(this.state.carryForward),
+            });
+            // Items already on the client may hold newer local changes
+            const loadedIds = new Set(this.state.items.filter(item => item.loaded).map(item => item.id));
+            this.mergeItemData([navigation.previous, ...navigation.next].filter(
+                data => data && !loadedIds.has(data.id)
+            ));
+        } catch (error) {
+            console.warn("No se pudieron precargar los elementos siguientes:", error);
         }
     }
 
@@ -844,11 +1007,11 @@ export class FleetInspectionMobile extends Component {
             const serverItems = await this.orm.searchRead(
                 "fleet.inspection.line",
                 [['inspection_id', '=', this.state.currentInspection.id]],
-                ['id', 'status'],
-                { order: 'sequence asc' }
+                ['id', 'status', 'needs_confirmation'],
+                { order: 'section_sequence asc, sequence asc, id asc' }
             );
             
-            const incompleteServerItems = serverItems.filter(item => !item.status);
+            const incompleteServerItems = serverItems.filter(isPending);
             console.log("Server verification:");
             console.log("Server items:", serverItems.length);
             console.log("Server incomplete:", incompleteServerItems.length);
@@ -860,6 +1023,7 @@ export class FleetInspectionMobile extends Component {
                     const frontendItem = this.state.items.find(item => item.id === serverItem.id);
                     if (frontendItem) {
                         frontendItem.status = serverItem.status;
+                        frontendItem.needs_confirmation = serverItem.needs_confirmation;
                     }
                 });
                 
@@ -874,8 +1038,7 @@ export class FleetInspectionMobile extends Component {
                     incompleteServerItems.some(serverItem => serverItem.id === item.id)
                 );
                 if (firstIncompleteIndex >= 0) {
-                    this.state.itemIndex = firstIncompleteIndex;
-                    this.state.currentItem = this.state.items[firstIncompleteIndex];
+                    await this.goToItem(firstIncompleteIndex);
                 }
             } else {
                 // All verified complete, complete the inspection directly
@@ -894,6 +1057,9 @@ export class FleetInspectionMobile extends Component {
             console.log("=== COMPLETE INSPECTION ===");
             console.log("Calling backend action_complete_inspection for inspection:", this.state.currentInspection.id);
             
+            // Timings must reach the server before completion flags them for the statistics
+            this.endItemDwell();
+            await this.flushTimings();
             // Call the backend method to complete the inspection
             await this.orm.call("fleet.inspection", "action_complete_inspection", [this.state.currentInspection.id]);
             
@@ -947,9 +1113,12 @@ export class FleetInspectionMobile extends Component {
         const ctx = canvas.getContext('2d');
         const rect = canvas.getBoundingClientRect();
         
-        // Set canvas size to match display size
-        canvas.width = rect.width;
-        canvas.height = rect.height;
+        // Backing store at device resolution, strokes stay in CSS pixels
+        const ratio = window.devicePixelRatio || 1;
+        canvas.width = Math.round(rect.width * ratio);
+        canvas.height = Math.round(rect.height * ratio);
+        ctx.scale(ratio, ratio);
+        this.signatureSize = { width: Math.round(rect.width), height: Math.round(rect.height) };
         
         // Set drawing style
         ctx.strokeStyle = '#000';
@@ -958,29 +1127,36 @@ export class FleetInspectionMobile extends Component {
         ctx.lineJoin = 'round';
         
         let isDrawing = false;
-        let hasSignature = false;
+        // Strokes are kept as [[x, y], ...] so the server can store a small SVG
+        this.signatureStrokes = [];
 
         // Mouse events
         const startDrawing = (e) => {
             isDrawing = true;
-            hasSignature = true;
             const rect = canvas.getBoundingClientRect();
+            const point = [Math.round(e.clientX - rect.left), Math.round(e.clientY - rect.top)];
+            this.signatureStrokes.push([point]);
             ctx.beginPath();
-            ctx.moveTo(e.clientX - rect.left, e.clientY - rect.top);
+            ctx.moveTo(point[0], point[1]);
         };
 
         const draw = (e) => {
             if (!isDrawing) return;
             const rect = canvas.getBoundingClientRect();
-            ctx.lineTo(e.clientX - rect.left, e.clientY - rect.top);
+            const point = [Math.round(e.clientX - rect.left), Math.round(e.clientY - rect.top)];
+            this.signatureStrokes[this.signatureStrokes.length - 1].push(point);
+            ctx.lineTo(point[0], point[1]);
             ctx.stroke();
         };
 
         const stopDrawing = () => {
             if (isDrawing) {
                 isDrawing = false;
-                // Save signature as base64
-                this.state.driverSignature = canvas.toDataURL().split(',')[1];
+                this.state.driverSignature = {
+                    strokes: this.signatureStrokes,
+                    width: this.signatureSize.width,
+                    height: this.signatureSize.height,
+                };
             }
         };
 
@@ -1028,7 +1204,8 @@ export class FleetInspectionMobile extends Component {
 
     clearSignature() {
         if (this.signatureCanvas && this.signatureCtx) {
-            this.signatureCtx.clearRect(0, 0, this.signatureCanvas.width, this.signatureCanvas.height);
+            this.signatureCtx.clearRect(0, 0, this.signatureSize.width, this.signatureSize.height);
+            this.signatureStrokes = [];
             this.state.driverSignature = null;
         }
     }
@@ -1044,10 +1221,11 @@ export class FleetInspectionMobile extends Component {
         }
 
         try {
-            // Save signature to inspection
-            await this.orm.write("fleet.inspection", [this.state.currentInspection], {
-                driver_signature: this.state.driverSignature
-            });
+            // Save signature strokes to inspection (stored server-side as SVG)
+            const { strokes, width, height } = this.state.driverSignature;
+            await this.orm.call("fleet.inspection", "save_signature", [
+                [this.inspectionId], strokes, width, height,
+            ], { role: 'driver' });
 
             // Now complete the inspection
             this.state.showingSignature = false;
@@ -1103,5 +1281,5 @@ export class FleetInspectionMobile extends Component {
     }
 }
 
-// Register the client action
-registry.category("actions").add("fleet_inspection_mobile", FleetInspectionMobile);
\ No newline at end of file
+// Loaded lazily by the fleet_inspection_mobile action, see inspection_mobile_loader.js
+registry.category("lazy_components").add("FleetInspectionMobile", FleetInspectionMobile);
\ No newline at end of file
@@ -0,0 +1,27 @@
+/** @odoo-module **/
+
+import { registry } from "@web/core/registry";
+import { getBundle, loadBundle } from "@web/core/assets";
+import { Component, onWillStart, xml } from "@odoo/owl";
+
+const MOBILE_BUNDLE = "fleet_inspection_mobile.assets_mobile";
+
+/**
+ * Lightweight backend entry point of the mobile inspection client action.
+ *
+ * The client itself (JS, SCSS and QWeb) lives in its own bundle, fetched
+ * the first time the action opens, so other backend users never download
+ * it. Once loaded, the component is taken from the lazy_components registry.
+ */
+export class FleetInspectionMobileLoader extends Component {
+    static template = xml`<t t-component="Component" t-props="props"/>`;
+
+    setup() {
+        onWillStart(async () => {
+            await loadBundle(await getBundle(MOBILE_BUNDLE));
+            this.Component = registry.category("lazy_components").get("FleetInspectionMobile");
+        });
+    }
+}
+
+registry.category("actions").add("fleet_inspection_mobile", FleetInspectionMobileLoader);
@@ -0,0 +1,88 @@
+/** @odoo-module **/
+
+const WORKER_URL = "/fleet_inspection_mobile/static/src/workers/photo_resize_worker.js";
+
+let worker = null;
+let nextRequestId = 0;
+const pendingRequests = new Map();
+
+function getWorker() {
+    if (!worker) {
+        worker = new Worker(WORKER_URL);
+        worker.addEventListener("message", ({ data }) => {
+            const request = pendingRequests.get(data.id);
+            pendingRequests.delete(data.id);
+            if (data.error) {
+                request.reject(new Error(data.error));
+            } else {
+                request.resolve(data);
+            }
+        });
+    }
+    return worker;
+}
+
+/**
+ * Same as the worker, on the main thread, for browsers without
+ * OffscreenCanvas support in workers.
+ */
+async function resizeOnMainThread(file, maxDimension, quality) {
+    const bitmap = await createImageBitmap(file, { imageOrientation: "from-image" });
+    const scale = Math.min(1, maxDimension / Math.max(bitmap.width, bitmap.height));
+    const canvas = document.createElement("canvas");
+    canvas.width = Math.round(bitmap.width * scale);
+    canvas.height = Math.round(bitmap.height * scale);
+    canvas.getContext("2d").drawImage(bitmap, 0, 0, canvas.width, canvas.height);
+    bitmap.close();
+    const toBlob = (type) => new Promise(resolve => canvas.toBlob(resolve, type, quality));
+    let blob = await toBlob("image/webp");
+    if (!blob || blob.type !== "image/webp") {
+        blob = await toBlob("image/jpeg");
+    }
+    return { blob, width: canvas.width, height: canvas.height };
+}
+
+/**
+ * Downscale a captured photo so its longest side fits ``maxDimension`` and
+ * re-encode it as WebP (or JPEG) with ``quality`` (0-1). The original file is
+ * returned when resizing is disabled or the browser cannot decode it.
+ *
+ * @param {File} file
+ * @param {{maxDimension: number, quality: number}} options
+ * @returns {Promise<Blob>}
+ */
+export async function resizePhoto(file, { maxDimension, quality }) {
+    if (!maxDimension || typeof createImageBitmap === "undefined") {
+        return file;
+    }
+    try {
+        let result;
+        if (typeof Worker !== "undefined" && typeof OffscreenCanvas !== "undefined") {
+            const id = nextRequestId++;
+            result = await new Promise((resolve, reject) => {
+                pendingRequests.set(id, { resolve, reject });
+                getWorker().postMessage({ id, file, maxDimension, quality });
+            });
+        } else {
+            result = await resizeOnMainThread(file, maxDimension, quality);
+        }
+        // Never upload a re-encoded photo bigger than the original
+        return result.blob.size < file.size ? result.blob : file;
+    } catch (error) {
+        console.warn("No se pudo reducir la foto, se sube el original:", error);
+        return file;
+    }
+}
+
+/**
+ * @param {Blob} blob
+ * @returns {Promise<string>} data URL of the blob
+ */
+export function blobToDataURL(blob) {
+    return new Promise((resolve, reject) => {
+        const reader = new FileReader();
+        reader.onload = () => resolve(reader.result);
+        reader.onerror = () => reject(reader.error);
+        reader.readAsDataURL(blob);
+    });
+}
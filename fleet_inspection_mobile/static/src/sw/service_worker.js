@@ -0,0 +1,159 @@
+/**
+ * Fleet Inspection Mobile - app shell service worker
+ *
+ * Served by /fleet_inspection_mobile/sw.js with the /web scope. Keeps the
+ * last /web page and everything the web client and the lazy inspection
+ * bundle fetch while booting, so a second launch of the inspection app
+ * starts from cache and still opens without network:
+ *
+ * - /web navigations: network first, cached shell of the same user when offline
+ * - /web/webclient/load_menus/ and translations/: cache first (hashed URLs)
+ * - /web/bundle/fleet_inspection_mobile.assets_mobile: network first
+ * - /web/assets/ bundles: cache first (their URLs carry a content hash)
+ * - static files: served from cache and refreshed in the background
+ *
+ * The /web page embeds the session info, so it is only stored once the
+ * client has reported which user it belongs to (see registerAppShell) and
+ * it is only served to that user. Logging out, or reaching the login page
+ * after the session expired, drops it along with the user's menus and
+ * translations. RPCs are never cached.
+ */
+const CACHE_VERSION = "__CACHE_VERSION__";
+const SHELL_CACHE = `fleet-inspection-shell-${CACHE_VERSION}`;
+const SESSION_CACHE = `fleet-inspection-session-${CACHE_VERSION}`;
+const ASSETS_CACHE = `fleet-inspection-assets-${CACHE_VERSION}`;
+const MAX_ASSET_ENTRIES = 60;
+const MAX_SESSION_ENTRIES = 10;
+// Where the key of the user the client last reported is kept
+const SESSION_KEY_URL = "/web/__fleet_inspection_session__";
+const MOBILE_BUNDLE_PATH = "/web/bundle/fleet_inspection_mobile.assets_mobile";
+
+self.addEventListener("install", () => self.skipWaiting());
+
+self.addEventListener("activate", (event) => {
+    event.waitUntil((async () => {
+        const keep = [SHELL_CACHE, SESSION_CACHE, ASSETS_CACHE];
+        for (const name of await caches.keys()) {
+            if (name.startsWith("fleet-inspection-") && !keep.includes(name)) {
+                await caches.delete(name);
+            }
+        }
+        await self.clients.claim();
+    })());
+});
+
+self.addEventListener("message", (event) => {
+    const data = event.data || {};
+    if (data.type === "fleet_inspection_session" && data.key) {
+        event.waitUntil(caches.open(SHELL_CACHE).then(
+            (cache) => cache.put(SESSION_KEY_URL, new Response(String(data.key)))
+        ));
+    }
+});
+
+async function trimCache(cache, maxEntries) {
+    const keys = await cache.keys();
+    for (const request of keys.slice(0, Math.max(0, keys.length - maxEntries))) {
+        await cache.delete(request);
+    }
+}
+
+async function shellUrl(cache) {
+    const key = await cache.match(SESSION_KEY_URL);
+    return key ? `/web?fleet_inspection_session=${encodeURIComponent(await key.text())}` : null;
+}
+
+async function networkFirstShell(request) {
+    const cache = await caches.open(SHELL_CACHE);
+    try {
+        const response = await fetch(request);
+        const url = await shellUrl(cache);
+        if (response.ok && url) {
+            // The shell does not depend on the URL fragment or query
+            await cache.put(url, response.clone());
+        }
+        return response;
+    } catch (error) {
+        const url = await shellUrl(cache);
+        const cached = url && await cache.match(url);
+        if (cached) {
+            return cached;
+        }
+        throw error;
+    }
+}
+
+async function networkFirst(request, cacheName) {
+    const cache = await caches.open(cacheName);
+    try {
+        const response = await fetch(request);
+        if (response.ok) {
+            await cache.put(request, response.clone());
+        }
+        return response;
+    } catch (error) {
+        const cached = await cache.match(request);
+        if (cached) {
+            return cached;
+        }
+        throw error;
+    }
+}
+
+async function cacheFirst(request, cacheName, maxEntries) {
+    const cache = await caches.open(cacheName);
+    const cached = await cache.match(request);
+    if (cached) {
+        return cached;
+    }
+    const response = await fetch(request);
+    if (response.ok) {
+        await cache.put(request, response.clone());
+        trimCache(cache, maxEntries);
+    }
+    return response;
+}
+
+async function staleWhileRevalidate(event) {
+    const cache = await caches.open(ASSETS_CACHE);
+    const cached = await cache.match(event.request);
+    const refresh = fetch(event.request).then(async (response) => {
+        if (response.ok) {
+            await cache.put(event.request, response.clone());
+        }
+        return response;
+    });
+    if (cached) {
+        event.waitUntil(refresh.catch(() => {}));
+        return cached;
+    }
+    return refresh;
+}
+
+async function clearSession(request) {
+    await caches.delete(SHELL_CACHE);
+    await caches.delete(SESSION_CACHE);
+    return fetch(request);
+}
+
+self.addEventListener("fetch", (event) => {
+    const request = event.request;
+    const url = new URL(request.url);
+    if (request.method !== "GET" || url.origin !== self.location.origin) {
+        return;
+    }
+    if (url.pathname === "/web/session/logout" || url.pathname === "/web/login") {
+        event.respondWith(clearSession(request));
+    } else if (request.mode === "navigate" && url.pathname === "/web") {
+        event.respondWith(networkFirstShell(request));
+    } else if (url.pathname.startsWith("/web/webclient/load_menus/")
+            || url.pathname.startsWith("/web/webclient/translations/")) {
+        event.respondWith(cacheFirst(request, SESSION_CACHE, MAX_SESSION_ENTRIES));
+    } else if (url.pathname === MOBILE_BUNDLE_PATH) {
+        event.respondWith(networkFirst(request, ASSETS_CACHE));
+    } else if (url.pathname.startsWith("/web/assets/")) {
+        event.respondWith(cacheFirst(request, ASSETS_CACHE, MAX_ASSET_ENTRIES));
+    } else if (url.pathname.startsWith("/web/static/") || url.pathname.startsWith("/fleet_inspection_mobile/static/")) {
+        event.respondWith(staleWhileRevalidate(event));
+    }
+});
@@ -0,0 +1,30 @@
+/**
+ * Fleet Inspection Mobile - photo resize worker
+ *
+ * Downscales a captured photo with OffscreenCanvas and re-encodes it as
+ * WebP (JPEG where the browser cannot encode WebP), off the UI thread.
+ *
+ * Message in:  { id, file, maxDimension, quality }
+ * Message out: { id, blob, width, height } or { id, error }
+ */
+self.addEventListener("message", async ({ data }) => {
+    const { id, file, maxDimension, quality } = data;
+    try {
+        const bitmap = await createImageBitmap(file, { imageOrientation: "from-image" });
+        const scale = Math.min(1, maxDimension / Math.max(bitmap.width, bitmap.height));
+        const width = Math.round(bitmap.width * scale);
+        const height = Math.round(bitmap.height * scale);
+        const canvas = new OffscreenCanvas(width, height);
+        const ctx = canvas.getContext("2d");
+        ctx.imageSmoothingQuality = "high";
+        ctx.drawImage(bitmap, 0, 0, width, height);
+        bitmap.close();
+        let blob = await canvas.convertToBlob({ type: "image/webp", quality });
+        if (blob.type !== "image/webp") {
+            blob = await canvas.convertToBlob({ type: "image/jpeg", quality });
+        }
+        self.postMessage({ id, blob, width, height });
+    } catch (error) {
+        self.postMessage({ id, error: error.message });
+    }
+});
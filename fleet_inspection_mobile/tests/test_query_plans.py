@@ -0,0 +1,169 @@
+# -*- coding: utf-8 -*-
+import json
+import logging
+from datetime import timedelta
+
+from odoo import fields
+from odoo.tests import TransactionCase, tagged
+
+_logger = logging.getLogger(__name__)
+
+PLAN_INSPECTIONS = 10000
+PLAN_VEHICLES = 200
+PLAN_USERS = 20
+PLAN_SECTIONS = 5
+PLAN_ITEMS_PER_SECTION = 6
+PLAN_TABLES = ('fleet_inspection', 'fleet_inspection_line', 'fleet_inspection_photo')
+
+
+@tagged('post_install', '-at_install')
+class TestQueryPlans(TransactionCase):
+    """The hot inspection queries must use indexes
+
+    Inspections, lines and photos are generated in the test transaction,
+    then every hot query is EXPLAINed and fails when it reads an inspection
+    table with a sequential scan.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.env = cls.env(context=dict(cls.env.context, tracking_disable=True, no_reset_password=True))
+        cls.sample = cls._generate_data(cls.env, PLAN_INSPECTIONS)
+
+    def _seq_scans(self, plan):
+        """Relations read with a sequential scan anywhere in ``plan``"""
+        if plan.get('Node Type') == 'Seq Scan':
+            yield plan['Relation Name']
+        for child in plan.get('Plans', []):
+            yield from self._seq_scans(child)
+
+    def test_hot_queries_use_indexes(self):
+        for label, table, query, params in self._hot_queries(self.env, self.sample):
+            with self.subTest(query=label):
+                self.env.cr.execute(f'EXPLAIN (FORMAT JSON) {query}', params)
+                plan = self.env.cr.fetchone()[0]
+                plan = (json.loads(plan) if isinstance(plan, str) else plan)[0]['Plan']
+                seq_scans = sorted(set(self._seq_scans(plan)) & set(PLAN_TABLES))
+                self.assertFalse(
+                    seq_scans,
+                    f"{label} ({table}) reads {', '.join(seq_scans)} with a sequential scan:\n"
+                    f"{json.dumps(plan, indent=2)}",
+                )
+
+    @classmethod
+    def _generate_data(cls, env, inspection_count):
+        """Synthetic vehicles, users, inspections, lines and photos; returns
+        sample ids for the query parameters"""
+        cr = env.cr
+        brand = env['fleet.vehicle.model.brand'].create({'name': 'Plan Check'})
+        model = env['fleet.vehicle.model'].create({'name': 'Plan Check', 'brand_id': brand.id})
+        vehicles = env['fleet.vehicle'].create([
+            {'model_id': model.id, 'license_plate': f'PLAN-{i}'} for i in range(PLAN_VEHICLES)
+        ])
+        users = env['res.users'].create([
+            {'name': f'Plan Check {i}', 'login': f'fleet_inspection_plan_check_{i}'} for i in range(PLAN_USERS)
+        ])
+        template = env['fleet.inspection.template']._load_template_data({
+            'name': 'Plan Check',
+            'active': False,
+            'sections': [{
+                'name': f'Section {s}',
+                'sequence': s,
+                'items': [f'Item {s}.{i}' for i in range(PLAN_ITEMS_PER_SECTION)],
+            } for s in range(PLAN_SECTIONS)],
+        })
+        env.flush_all()
+
+        _logger.info(f"Generating {inspection_count} inspections")
+        cr.execute("SELECT setseed(0.42)")
+        # The first inspection of every vehicle is its draft, the rest are completed
+        cr.execute("""
+            INSERT INTO fleet_inspection
+                   (vehicle_id, driver_id, template_id, inspection_date, state, overall_status,
+                    create_uid, create_date, write_uid, write_date)
+            SELECT (%(vehicles)s::int[])[1 + g %% %(vehicle_count)s],
+                   %(driver)s, %(template)s,
+                   now() - g * interval '1 hour',
+                   CASE WHEN g < %(vehicle_count)s THEN 'draft' ELSE 'completed' END,
+                   CASE WHEN g < %(vehicle_count)s THEN NULL
+                        ELSE (ARRAY['good', 'good', 'attention', 'maintenance'])[1 + floor(random() * 4)::int] END,
+                   (%(users)s::int[])[1 + floor(random() * %(user_count)s)::int],
+                   now(), %(uid)s, now()
+              FROM generate_series(0, %(count)s - 1) g
+         RETURNING id
+        """, {
+            'vehicles': vehicles.ids, 'vehicle_count': len(vehicles), 'driver': env.user.partner_id.id,
+            'template': template.id, 'users': users.ids, 'user_count': len(users),
+            'uid': env.uid, 'count': inspection_count,
+        })
+        inspection_ids = [row[0] for row in cr.fetchall()]
+        cr.execute("""
+            INSERT INTO fleet_inspection_line
+                   (inspection_id, template_item_id, status, sequence, section_sequence,
+                    needs_confirmation, create_uid, create_date, write_uid, write_date)
+            SELECT i.id, t.id,
+                   CASE WHEN i.state = 'draft' AND random() < 0.5 THEN NULL
+                        ELSE (ARRAY['bien', 'bien', 'bien', 'regular', 'mal', 'na'])[1 + floor(random() * 6)::int] END,
+                   t.sequence, t.section_sequence, false, %(uid)s, now(), %(uid)s, now()
+              FROM fleet_inspection i
+              JOIN fleet_inspection_template_item t ON t.template_id = i.template_id
+             WHERE i.id = ANY(%(inspections)s)
+        """, {'uid': env.uid, 'inspections': inspection_ids})
+        cr.execute("""
+            INSERT INTO fleet_inspection_photo
+                   (line_id, inspection_id, name, sequence, taken_at,
+                    create_uid, create_date, write_uid, write_date)
+            SELECT l.id, l.inspection_id, 'Plan Check', 10, now(), %(uid)s, now(), %(uid)s, now()
+              FROM fleet_inspection_line l
+             WHERE l.inspection_id = ANY(%(inspections)s) AND l.status = 'mal'
+        """, {'uid': env.uid, 'inspections': inspection_ids})
+        for table in PLAN_TABLES:
+            cr.execute(f'ANALYZE "{table}"')
+
+        cr.execute("""
+            SELECT l.inspection_id, l.id FROM fleet_inspection_line l
+             WHERE l.inspection_id = %s ORDER BY l.id LIMIT 1
+        """, [inspection_ids[len(inspection_ids) // 2]])
+        inspection_id, line_id = cr.fetchone()
+        return {
+            'vehicle_id': vehicles[len(vehicles) // 2].id,
+            'user_id': users[0].id,
+            'inspection_id': inspection_id,
+            'line_id': line_id,
+        }
+
+    def _hot_queries(self, env, sample):
+        """(label, table, SQL, params) of the queries the mobile app, the
+        board and the reports run most"""
+        Inspection = env['fleet.inspection']
+        Line = env['fleet.inspection.line']
+        Photo = env['fleet.inspection.photo']
+        day = fields.Datetime.now() - timedelta(days=1)
+        orm_queries = [
+            ("last completed inspection of a vehicle", Inspection, Inspection._search(
+                [('vehicle_id', '=', sample['vehicle_id']), ('state', '=', 'completed')],
+                order='inspection_date desc, id desc', limit=1)),
+            ("draft of a vehicle", Inspection, Inspection._search(
+                [('vehicle_id', '=', sample['vehicle_id']), ('state', '=', 'draft')], limit=1)),
+            ("drafts of a user", Inspection, Inspection._search(
+                [('state', '=', 'draft'), ('create_uid', '=', sample['user_id'])])),
+            ("inspections of one day", Inspection, Inspection._search(
+                [('inspection_date', '>=', day - timedelta(days=1)), ('inspection_date', '<', day)],
+                order='inspection_date desc')),
+            ("pending lines of an inspection", Line, Line._search(
+                [('inspection_id', '=', sample['inspection_id']), ('status', '=', False)])),
+            ("bad lines of an inspection", Line, Line._search(
+                [('inspection_id', '=', sample['inspection_id']), ('status', '=', 'mal')])),
+            ("photos of a line", Photo, Photo._search([('line_id', '=', sample['line_id'])])),
+            ("photos of an inspection", Photo, Photo._search([('inspection_id', '=', sample['inspection_id'])])),
+        ]
+        for label, model, query in orm_queries:
+            sql, params = query.select()
+            yield label, model._table, sql, params
+        yield "recent vehicles of a user", 'fleet_inspection', """
+            SELECT DISTINCT ON (vehicle_id) vehicle_id, inspection_date, overall_status
+              FROM fleet_inspection
+             WHERE state = 'completed' AND create_uid = %s
+          ORDER BY vehicle_id, inspection_date DESC, id DESC
+        """, [sample['user_id']]
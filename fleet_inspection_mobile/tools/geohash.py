@@ -0,0 +1,89 @@
+# -*- coding: utf-8 -*-
+"""Geohash encoding and radius cover, for location queries without PostGIS.
+
+A geohash is a base32 string where every character halves the cell again,
+so points of a cell share its prefix and a btree index with
+``varchar_pattern_ops`` answers ``geohash LIKE 'prefix%'`` directly. A circle
+of radius R is covered by the cell containing its centre plus the 8
+neighbouring cells, at the finest precision whose cells are at least R wide;
+the candidates are then filtered with the exact haversine distance.
+"""
+import math
+
+BASE32 = '0123456789bcdefghjkmnpqrstuvwxyz'
+PRECISION = 9
+EARTH_RADIUS_M = 6371008.8
+METERS_PER_DEGREE = math.pi * EARTH_RADIUS_M / 180
+
+
+def encode(latitude, longitude, precision=PRECISION):
+    """Geohash of a point"""
+    lat_range = [-90.0, 90.0]
+    lon_range = [-180.0, 180.0]
+    chars = []
+    bits = 0
+    bit_count = 0
+    even = True
+    while len(chars) < precision:
+        value, bounds = (longitude, lon_range) if even else (latitude, lat_range)
+        middle = (bounds[0] + bounds[1]) / 2
+        bits <<= 1
+        if value >= middle:
+            bits |= 1
+            bounds[0] = middle
+        else:
+            bounds[1] = middle
+        even = not even
+        bit_count += 1
+        if bit_count == 5:
+            chars.append(BASE32[bits])
+            bits = 0
+            bit_count = 0
+    return ''.join(chars)
+
+
+def cell_size(precision):
+    """(height, width) of a cell in degrees"""
+    lat_bits = 5 * precision // 2
+    lon_bits = 5 * precision - lat_bits
+    return 180.0 / 2 ** lat_bits, 360.0 / 2 ** lon_bits
+
+
+def cover(latitude, longitude, radius_m):
+    """Geohash prefixes whose cells contain every point within ``radius_m``"""
+    lat_scale = math.cos(math.radians(min(abs(latitude), 89.0)))
+    precision = 1
+    for candidate in range(PRECISION, 0, -1):
+        height, width = cell_size(candidate)
+        if min(height, width * lat_scale) * METERS_PER_DEGREE >= radius_m:
+            precision = candidate
+            break
+    height, width = cell_size(precision)
+    cells = set()
+    for dlat in (-height, 0.0, height):
+        for dlon in (-width, 0.0, width):
+            lat = latitude + dlat
+            if not -90.0 <= lat <= 90.0:
+                continue
+            lon = (longitude + dlon + 180.0) % 360.0 - 180.0
+            cells.add(encode(lat, lon, precision))
+    return sorted(cells)
+
+
+def haversine_sql(lat, lon, lat2='%s', lon2='%s'):
+    """SQL expression of the great circle distance in metres between the
+    ``lat``/``lon`` columns and ``lat2``/``lon2`` (placeholders by default)"""
+    return f"""
+        2 * {EARTH_RADIUS_M} * asin(sqrt(
+            power(sin(radians({lat} - {lat2}) / 2), 2)
+            + cos(radians({lat2})) * cos(radians({lat})) * power(sin(radians({lon} - {lon2}) / 2), 2)
+        ))
+    """
+
+
+def haversine(lat1, lon1, lat2, lon2):
+    """Great circle distance in metres"""
+    dlat = math.radians(lat2 - lat1)
+    dlon = math.radians(lon2 - lon1)
+    a = math.sin(dlat / 2) ** 2 + math.cos(math.radians(lat1)) * math.cos(math.radians(lat2)) * math.sin(dlon / 2) ** 2
+    return 2 * EARTH_RADIUS_M * math.asin(math.sqrt(a))
@@ -0,0 +1,119 @@
+# -*- coding: utf-8 -*-
+"""Streaming export of inspections with their lines and photo URLs.
+
+Rows are produced by generators that open their own cursor, so they can be
+consumed by an HTTP response after the request cursor is closed. Inspections
+are read in keyset batches (``id > last id``), never all at once.
+"""
+import csv
+import io
+import os
+import tempfile
+
+import xlsxwriter
+
+from odoo import api
+
+EXPORT_BATCH_SIZE = 500
+XLSX_CHUNK_SIZE = 64 * 1024
+EXPORT_COLUMNS = [
+    'inspection_id', 'inspection', 'vehicle', 'license_plate', 'driver',
+    'inspection_date', 'state', 'overall_status', 'odometer',
+    'section', 'item', 'status', 'observations', 'photo_urls',
+]
+
+
+def export_domain(vehicle_id=None, date_from=None, date_to=None, state=None, overall_status=None):
+    """Search domain on fleet.inspection for the export filters"""
+    domain = []
+    if vehicle_id:
+        domain.append(('vehicle_id', '=', int(vehicle_id)))
+    if date_from:
+        domain.append(('inspection_date', '>=', f'{date_from} 00:00:00'))
+    if date_to:
+        domain.append(('inspection_date', '<=', f'{date_to} 23:59:59'))
+    if state:
+        domain.append(('state', '=', state))
+    if overall_status:
+        domain.append(('overall_status', '=', overall_status))
+    return domain
+
+
+def iter_export_rows(registry, uid, context, domain, batch_size=EXPORT_BATCH_SIZE):
+    """One tuple per inspection line, in EXPORT_COLUMNS order"""
+    with registry.cursor() as cr:
+        env = api.Environment(cr, uid, context)
+        Inspection = env['fleet.inspection']
+        inspection_sql, inspection_params = Inspection._search(domain).subselect()
+        last_id = 0
+        while True:
+            cr.execute(f"""
+                SELECT id FROM fleet_inspection
+                 WHERE id IN ({inspection_sql}) AND id > %s
+              ORDER BY id
+                 LIMIT %s
+            """, [*inspection_params, last_id, batch_size])
+            inspection_ids = [row[0] for row in cr.fetchall()]
+            if not inspection_ids:
+                return
+            last_id = inspection_ids[-1]
+            cr.execute("""
+                SELECT i.id, i.name, v.name, v.license_plate, p.name,
+                       i.inspection_date, i.state, i.overall_status, i.odometer,
+                       s.name, t.name, l.status, l.observations,
+                       (SELECT string_agg('/web/image/fleet.inspection.photo/' || ph.id || '/image', ' ' ORDER BY ph.sequence, ph.id)
+                          FROM fleet_inspection_photo ph
+                         WHERE ph.line_id = l.id)
+                  FROM fleet_inspection i
+                  JOIN fleet_vehicle v ON v.id = i.vehicle_id
+             LEFT JOIN res_partner p ON p.id = i.driver_id
+             LEFT JOIN fleet_inspection_line l ON l.inspection_id = i.id
+             LEFT JOIN fleet_inspection_template_item t ON t.id = l.template_item_id
+             LEFT JOIN fleet_inspection_template_section s ON s.id = t.section_id
+                 WHERE i.id IN %s
+              ORDER BY i.id, l.section_sequence, l.sequence, l.id
+            """, [tuple(inspection_ids)])
+            yield from cr.fetchall()
+            # Keep the transaction's memory flat between batches
+            env.invalidate_all()
+
+
+def iter_csv_export(rows):
+    """Encoded CSV chunks, one per batch of rows"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(EXPORT_COLUMNS)
+    for count, row in enumerate(rows, start=1):
+        writer.writerow(['' if value is None else value for value in row])
+        if count % EXPORT_BATCH_SIZE == 0:
+            yield buffer.getvalue().encode()
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue().encode()
+
+
+def iter_xlsx_export(rows):
+    """XLSX file chunks; the workbook is written row by row to a temporary
+    file (xlsxwriter constant_memory) and streamed once complete"""
+    fd, path = tempfile.mkstemp(suffix='.xlsx')
+    os.close(fd)
+    try:
+        workbook = xlsxwriter.Workbook(path, {'constant_memory': True, 'remove_timezone': True})
+        sheet = workbook.add_worksheet('Inspecciones')
+        date_format = workbook.add_format({'num_format': 'yyyy-mm-dd hh:mm'})
+        bold = workbook.add_format({'bold': True})
+        sheet.write_row(0, 0, EXPORT_COLUMNS, bold)
+        date_column = EXPORT_COLUMNS.index('inspection_date')
+        for row_number, row in enumerate(rows, start=1):
+            for column, value in enumerate(row):
+                if value is None:
+                    continue
+                if column == date_column:
+                    sheet.write_datetime(row_number, column, value, date_format)
+                else:
+                    sheet.write(row_number, column, value)
+        workbook.close()
+        with open(path, 'rb') as xlsx_file:
+            yield from iter(lambda: xlsx_file.read(XLSX_CHUNK_SIZE), b'')
+    finally:
+        os.unlink(path)
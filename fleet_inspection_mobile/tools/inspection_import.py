@@ -0,0 +1,206 @@
+# -*- coding: utf-8 -*-
+"""Streaming importer for historical (paper / spreadsheet) inspections.
+
+The file has one row per inspected item with the columns ``license_plate``,
+``inspection_date``, ``section``, ``item`` and ``status`` plus the optional
+``driver``, ``odometer`` and ``observations``. Consecutive rows with the same
+plate and date form one inspection. Rows are read one at a time and written
+in batches of inspections, so memory use does not depend on the file size.
+"""
+import csv
+import io
+import logging
+
+from odoo import fields
+from odoo.exceptions import UserError
+
+try:
+    import openpyxl
+except ImportError:
+    openpyxl = None
+
+_logger = logging.getLogger(__name__)
+
+STATUS_ALIASES = {
+    'bien': 'bien', 'b': 'bien', 'ok': 'bien',
+    'regular': 'regular', 'r': 'regular',
+    'mal': 'mal', 'm': 'mal',
+    'na': 'na', 'n/a': 'na', 'no aplica': 'na',
+}
+REQUIRED_COLUMNS = ('license_plate', 'inspection_date', 'section', 'item', 'status')
+MAX_REPORTED_ERRORS = 50
+IMPORT_CONTEXT = {
+    'tracking_disable': True,
+    'mail_create_nolog': True,
+    'mail_notrack': True,
+}
+
+
+def iter_csv_rows(binary_file):
+    """Rows of a CSV file as dicts keyed by lowercase header"""
+    reader = csv.reader(io.TextIOWrapper(binary_file, encoding='utf-8-sig', newline=''))
+    header = [column.strip().lower() for column in next(reader, [])]
+    for row in reader:
+        if any(row):
+            yield dict(zip(header, row))
+
+
+def iter_xlsx_rows(binary_file):
+    """Rows of the first sheet of an XLSX file as dicts keyed by lowercase header"""
+    if openpyxl is None:
+        raise UserError("Se necesita la librería openpyxl para importar archivos XLSX.")
+    workbook = openpyxl.load_workbook(binary_file, read_only=True, data_only=True)
+    try:
+        rows = workbook.worksheets[0].iter_rows(values_only=True)
+        header = [str(column or '').strip().lower() for column in next(rows, ())]
+        for row in rows:
+            if any(value not in (None, '') for value in row):
+                yield dict(zip(header, row))
+    finally:
+        workbook.close()
+
+
+def iter_file_rows(binary_file, filename):
+    if (filename or '').lower().endswith('.xlsx'):
+        return iter_xlsx_rows(binary_file)
+    return iter_csv_rows(binary_file)
+
+
+class InspectionImporter:
+    """Write inspections read from a row stream in bounded batches.
+
+    Each batch creates its inspections and all their lines with one
+    multi-create each, then flushes (which recomputes the inspection
+    summaries once for the whole batch) and empties the ORM cache.
+    """
+
+    def __init__(self, env, template, batch_size=200, commit=False):
+        self.env = env.with_context(**IMPORT_CONTEXT)
+        self.template = template
+        self.batch_size = batch_size
+        self.commit = commit
+        self.inspection_count = 0
+        self.line_count = 0
+        self.error_count = 0
+        self.errors = []
+        self.item_ids = {
+            (item.section_id.name.strip().lower(), item.name.strip().lower()): item.id
+            for item in template.item_ids
+        }
+
+    def _error(self, row_number, message):
+        self.error_count += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append(f"Fila {row_number}: {message}")
+
+    def run(self, rows):
+        """Import ``rows`` (dicts as produced by :func:`iter_file_rows`)"""
+        batch = []
+        current_key = None
+        for row_number, row in enumerate(rows, start=2):
+            missing = [column for column in REQUIRED_COLUMNS if not row.get(column)]
+            if missing:
+                self._error(row_number, f"faltan columnas {', '.join(missing)}")
+                continue
+            key = (str(row['license_plate']).strip(), str(row['inspection_date']).strip())
+            if key != current_key:
+                if len(batch) >= self.batch_size:
+                    self._write_batch(batch)
+                    batch = []
+                batch.append({'key': key, 'row_number': row_number, 'header': row, 'rows': []})
+                current_key = key
+            batch[-1]['rows'].append((row_number, row))
+        if batch:
+            self._write_batch(batch)
+        return self
+
+    def _write_batch(self, batch):
+        plates = list({inspection['key'][0] for inspection in batch})
+        vehicles = {
+            vehicle.license_plate: vehicle
+            for vehicle in self.env['fleet.vehicle'].search([('license_plate', 'in', plates)])
+        }
+        driver_names = list({str(inspection['header'].get('driver') or '').strip() for inspection in batch} - {''})
+        drivers = {
+            partner.name: partner.id
+            for partner in self.env['res.partner'].search([('name', 'in', driver_names)])
+        } if driver_names else {}
+
+        inspections_vals = []
+        lines_by_inspection = []
+        for inspection in batch:
+            plate, date = inspection['key']
+            header = inspection['header']
+            vehicle = vehicles.get(plate)
+            if not vehicle:
+                self._error(inspection['row_number'], f"vehículo con patente {plate} no encontrado")
+                continue
+            try:
+                inspection_date = fields.Datetime.to_datetime(header['inspection_date'])
+            except ValueError:
+                inspection_date = None
+            if not inspection_date:
+                self._error(inspection['row_number'], f"fecha no válida: {date}")
+                continue
+            try:
+                odometer = float(header.get('odometer') or 0.0)
+            except (TypeError, ValueError):
+                self._error(inspection['row_number'], f"odómetro no válido: {header.get('odometer')}")
+                continue
+            lines_vals = self._lines_vals(inspection['rows'])
+            if not lines_vals:
+                continue
+            driver = str(header.get('driver') or '').strip()
+            inspections_vals.append({
+                'vehicle_id': vehicle.id,
+                'driver_id': drivers.get(driver) or vehicle.driver_id.id or self.env.user.partner_id.id,
+                'inspection_date': inspection_date,
+                'odometer': odometer,
+                'template_id': self.template.id,
+                'state': 'completed',
+            })
+            lines_by_inspection.append(lines_vals)
+
+        if inspections_vals:
+            inspections = self.env['fleet.inspection'].create(inspections_vals)
+            all_lines_vals = []
+            for inspection, lines_vals in zip(inspections, lines_by_inspection):
+                for vals in lines_vals:
+                    vals['inspection_id'] = inspection.id
+                all_lines_vals.extend(lines_vals)
+            self.env['fleet.inspection.line'].create(all_lines_vals)
+            self.inspection_count += len(inspections)
+            self.line_count += len(all_lines_vals)
+
+        # Summaries of the whole batch are recomputed here, then the cache
+        # is emptied so memory does not grow with the file
+        self.env.flush_all()
+        self.env.invalidate_all()
+        if self.commit:
+            self.env.cr.commit()
+        _logger.info(f"Imported {self.inspection_count} inspections ({self.line_count} items), {self.error_count} errors")
+
+    def _lines_vals(self, rows):
+        lines_vals = []
+        seen = set()
+        for row_number, row in rows:
+            section = str(row['section']).strip()
+            name = str(row['item']).strip()
+            item_id = self.item_ids.get((section.lower(), name.lower()))
+            if not item_id:
+                self._error(row_number, f"elemento '{section} / {name}' no existe en la plantilla")
+                continue
+            status = STATUS_ALIASES.get(str(row['status']).strip().lower())
+            if not status:
+                self._error(row_number, f"estado no válido: {row['status']}")
+                continue
+            if item_id in seen:
+                self._error(row_number, f"elemento '{section} / {name}' repetido")
+                continue
+            seen.add(item_id)
+            lines_vals.append({
+                'template_item_id': item_id,
+                'status': status,
+                'observations': str(row.get('observations') or '').strip() or False,
+            })
+        return lines_vals
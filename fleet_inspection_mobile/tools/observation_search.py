@@ -0,0 +1,39 @@
+# -*- coding: utf-8 -*-
+"""Full-text search over inspection and line observations.
+
+Both tables get a generated ``observations_tsv`` column (Spanish stemming,
+so "frenos gastados" also finds "freno gastado"; words whose stems differ,
+like "pérdida" and "pierde", do not match) with a GIN index. The column
+is computed by PostgreSQL on every write, the ORM never sees it.
+"""
+import logging
+
+from odoo import tools
+
+_logger = logging.getLogger(__name__)
+
+FTS_CONFIG = 'spanish'
+TSV_COLUMN = 'observations_tsv'
+
+
+def ensure_tsvector_column(cr, table, source_column='observations'):
+    """Add the generated tsvector column of ``table`` and its GIN index"""
+    if not tools.column_exists(cr, table, TSV_COLUMN):
+        _logger.info(f"Adding full-text column {table}.{TSV_COLUMN}")
+        cr.execute(f"""
+            ALTER TABLE "{table}" ADD COLUMN "{TSV_COLUMN}" tsvector
+            GENERATED ALWAYS AS (to_tsvector('{FTS_CONFIG}', coalesce("{source_column}", ''))) STORED
+        """)
+    tools.create_index(cr, f'{table}_{TSV_COLUMN}_idx', table, [f'"{TSV_COLUMN}"'], method='gin')
+
+
+def matching_inspections_query(query_text):
+    """SQL and params selecting the ids of inspections whose own observations
+    or any line observation match ``query_text`` (web search syntax)"""
+    return f"""
+        SELECT id FROM fleet_inspection
+         WHERE {TSV_COLUMN} @@ websearch_to_tsquery('{FTS_CONFIG}', %s)
+         UNION
+        SELECT inspection_id FROM fleet_inspection_line
+         WHERE {TSV_COLUMN} @@ websearch_to_tsquery('{FTS_CONFIG}', %s)
+    """, [query_text, query_text]
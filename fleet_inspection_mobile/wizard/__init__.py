@@ -0,0 +1,4 @@
+# -*- coding: utf-8 -*-
+from . import inspection_export_wizard
+from . import inspection_import_wizard
+from . import template_import_wizard
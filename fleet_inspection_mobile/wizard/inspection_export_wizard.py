@@ -0,0 +1,38 @@
+# -*- coding: utf-8 -*-
+from urllib.parse import urlencode
+
+from odoo import models, fields
+
+
+class FleetInspectionExportWizard(models.TransientModel):
+    _name = 'fleet.inspection.export.wizard'
+    _description = 'Exportar Inspecciones'
+
+    file_format = fields.Selection([('csv', 'CSV'), ('xlsx', 'Excel (XLSX)')], string='Formato', default='csv', required=True)
+    vehicle_id = fields.Many2one('fleet.vehicle', string='Vehículo')
+    date_from = fields.Date(string='Desde')
+    date_to = fields.Date(string='Hasta')
+    state = fields.Selection([
+        ('draft', 'En Progreso'),
+        ('completed', 'Completado'),
+        ('cancelled', 'Cancelled')
+    ], string='Estado')
+    overall_status = fields.Selection([
+        ('good', 'Bueno - Listo para Usar'),
+        ('attention', 'Atención Requerida'),
+        ('maintenance', 'Requiere Mantenimiento')
+    ], string='Estado General')
+
+    def action_export(self):
+        """Download the export, streamed by /fleet_inspection_mobile/export"""
+        self.ensure_one()
+        params = {'file_format': self.file_format}
+        for field_name in ('vehicle_id', 'date_from', 'date_to', 'state', 'overall_status'):
+            value = self[field_name]
+            if value:
+                params[field_name] = value.id if field_name == 'vehicle_id' else value
+        return {
+            'type': 'ir.actions.act_url',
+            'url': f'/fleet_inspection_mobile/export?{urlencode(params)}',
+            'target': 'self',
+        }
@@ -0,0 +1,47 @@
+# -*- coding: utf-8 -*-
+import base64
+import io
+
+from odoo import models, fields, api
+from odoo.exceptions import UserError
+
+from ..tools.inspection_import import InspectionImporter, iter_file_rows
+
+
+class FleetInspectionImportWizard(models.TransientModel):
+    _name = 'fleet.inspection.import.wizard'
+    _description = 'Importar Inspecciones Históricas'
+
+    file = fields.Binary(string='Archivo', required=True)
+    filename = fields.Char(string='Nombre del Archivo')
+    template_id = fields.Many2one(
+        'fleet.inspection.template', string='Plantilla', required=True,
+        default=lambda self: self._default_template_id(),
+    )
+    batch_size = fields.Integer(string='Inspecciones por Lote', default=200)
+    state = fields.Selection([('draft', 'Borrador'), ('done', 'Importado')], default='draft')
+    result = fields.Text(string='Resultado', readonly=True)
+
+    @api.model
+    def _default_template_id(self):
+        template_id = self.env.company._get_inspection_policy().template_id
+        return template_id or self.env['fleet.inspection.template'].search([('active', '=', True)], limit=1).id
+
+    def action_import(self):
+        self.ensure_one()
+        if self.batch_size <= 0:
+            raise UserError("El tamaño de lote debe ser mayor que cero.")
+        rows = iter_file_rows(io.BytesIO(base64.b64decode(self.file)), self.filename)
+        importer = InspectionImporter(self.env, self.template_id, batch_size=self.batch_size).run(rows)
+        result = [f"Inspecciones importadas: {importer.inspection_count} ({importer.line_count} elementos)"]
+        if importer.error_count:
+            result.append(f"Filas con errores: {importer.error_count}")
+            result.extend(importer.errors)
+        self.write({'state': 'done', 'result': '\n'.join(result)})
+        return {
+            'type': 'ir.actions.act_window',
+            'res_model': self._name,
+            'res_id': self.id,
+            'view_mode': 'form',
+            'target': 'new',
+        }
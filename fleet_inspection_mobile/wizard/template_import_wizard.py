@@ -0,0 +1,56 @@
+# -*- coding: utf-8 -*-
+import base64
+import json
+
+from odoo import models, fields
+from odoo.exceptions import UserError
+
+try:
+    import yaml
+except ImportError:
+    yaml = None
+
+
+class FleetInspectionTemplateImportWizard(models.TransientModel):
+    _name = 'fleet.inspection.template.import.wizard'
+    _description = 'Importar Plantillas de Inspección'
+
+    file = fields.Binary(string='Archivo', required=True)
+    filename = fields.Char(string='Nombre del Archivo')
+
+    def _parse_file(self):
+        content = base64.b64decode(self.file)
+        if (self.filename or '').lower().endswith(('.yaml', '.yml')):
+            if yaml is None:
+                raise UserError("Se necesita la librería PyYAML para importar archivos YAML.")
+            try:
+                return yaml.safe_load(content)
+            except yaml.YAMLError as e:
+                raise UserError(f"Archivo YAML no válido: {e}")
+        try:
+            return json.loads(content)
+        except ValueError as e:
+            raise UserError(f"Archivo JSON no válido: {e}")
+
+    def action_import(self):
+        """Create the template(s) of the file, sections and items in batches"""
+        self.ensure_one()
+        data = self._parse_file()
+        templates_data = data if isinstance(data, list) else [data]
+        if not all(isinstance(template_data, dict) for template_data in templates_data):
+            raise UserError("Formato de plantilla no válido.")
+        Template = self.env['fleet.inspection.template']
+        templates = Template.browse()
+        for template_data in templates_data:
+            templates |= Template._load_template_data(template_data)
+        action = {
+            'type': 'ir.actions.act_window',
+            'name': 'Plantillas de Inspección',
+            'res_model': 'fleet.inspection.template',
+            'target': 'current',
+        }
+        if len(templates) == 1:
+            action.update(view_mode='form', res_id=templates.id)
+        else:
+            action.update(view_mode='tree,form', domain=[('id', 'in', templates.ids)])
+        return action